@@ -13,10 +13,17 @@ Usage with persistence:
         config = {"configurable": {"thread_id": "migration-123"}}
         result = await graph.ainvoke(input_data, config, durability="async")
 """
+import hashlib
+import json
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
+from langgraph.cache.memory import InMemoryCache
 from langgraph.graph import StateGraph, START, END
+from langgraph.types import CachePolicy
 from agent.state import AgentState
+# Agent nodes import the LangChain agent stack (create_agent, middleware, models,
+# tools) on first call, so importing the graph stays cheap on cold start
 from agent.nodes.splice import splicer_setup
 from agent.nodes.planner import planner_api
 from agent.nodes.target import target_agent
@@ -38,8 +45,8 @@ def if_check_failed(state: AgentState):
     If check found errors, proceed to check_revisor to fix them.
     Otherwise, skip straight to clean_up.
     """
-    check_output = state.get("check_output", {})
-    if not check_output.get("passed", True):
+    check_output = state.get("check_output")
+    if check_output is not None and not check_output.get("passed", True):
         return "check_revisor_agent"
     return "clean_up"
 
@@ -53,14 +60,43 @@ def if_check_failed(state: AgentState):
 #         return "revisor_agent"
 #     return END
 
+def _exploration_cache_key(*fields: str):
+    """
+    Node cache key over the state fields an exploration node reads, scoped to the
+    requesting user (cache_scope) so cached repo contents are never shared across users.
+    """
+    def key_func(state: AgentState) -> str:
+        payload = [state.get("cache_scope")] + [state.get(f) for f in fields]
+        return hashlib.blake2b(json.dumps(payload, default=str, sort_keys=True).encode()).hexdigest()
+    return key_func
+
+
+# Source/target exploration is read-only; identical re-runs within the TTL reuse the result
+_EXPLORATION_CACHE_TTL = 600
+_node_cache = InMemoryCache()
+
 # Graph
 workflow = StateGraph(AgentState)
 
 # Nodes
 workflow.add_node("splicer_setup", splicer_setup)
 workflow.add_node("planner_api", planner_api)
-workflow.add_node("target_agent", target_agent)
-workflow.add_node("source_agent", source_agent)
+workflow.add_node(
+    "target_agent",
+    target_agent,
+    cache_policy=CachePolicy(
+        key_func=_exploration_cache_key("target_repo", "target_exploration", "end_goal"),
+        ttl=_EXPLORATION_CACHE_TTL,
+    ),
+)
+workflow.add_node(
+    "source_agent",
+    source_agent,
+    cache_policy=CachePolicy(
+        key_func=_exploration_cache_key("source_repo", "source_exploration", "end_goal"),
+        ttl=_EXPLORATION_CACHE_TTL,
+    ),
+)
 workflow.add_node("paster_agent", paster_agent)
 workflow.add_node("integrator_agent", integrator_agent)
 workflow.add_node("check_node", check_node)
@@ -70,6 +106,9 @@ workflow.add_node("check_node", check_node)
 workflow.add_node("clean_up", clean_up)
 
 # Workflow
+# Fan-out edges run in the same superstep, so splicer_setup runs alongside the
+# planner and target_agent/source_agent explore concurrently (no composite node needed).
+# paster_agent waits on all three.
 workflow.add_edge(START, "splicer_setup")
 workflow.add_edge(START, "planner_api")
 workflow.add_edge("planner_api", "target_agent")
@@ -124,10 +163,40 @@ def compile_graph(checkpointer: "BaseCheckpointSaver | None" = None):
         # Without persistence (testing)
         graph = compile_graph()
         result = graph.invoke(input_data)
+    
+    Compiled graphs are cached per checkpointer instance, so repeated calls
+    with the same checkpointer (or None) reuse one compiled graph.
+    """
+    return _compile_cached(checkpointer)
+
+
+@lru_cache(maxsize=4)
+def _compile_cached(checkpointer: "BaseCheckpointSaver | None"):
+    """
+    Compile the workflow once per checkpointer.
+    Keyed on the checkpointer object itself (identity hash), and the cache holds
+    a reference to it, so a recycled id() can never map to a stale graph.
+    """
+    return workflow.compile(checkpointer=checkpointer, cache=_node_cache)
+
+
+def preload_node_dependencies() -> None:
+    """
+    Import the agent stack that nodes otherwise load on first call.
+    
+    Long-running servers call this at startup so the first run doesn't pay the
+    import cost; `langgraph dev` and scripts keep importing the graph cheaply.
     """
-    return workflow.compile(checkpointer=checkpointer)
+    import langchain.agents  # noqa: F401
+    import langchain.agents.structured_output  # noqa: F401
+    import langchain_core.messages  # noqa: F401
+    import langchain_mcp_adapters.client  # noqa: F401
+    import langchain_mcp_adapters.tools  # noqa: F401
+    import components.model  # noqa: F401
+    import components.responses  # noqa: F401
+    import components.tools  # noqa: F401
 
 
 # Export for langgraph dev (local testing with in-memory checkpointing)
 # Production uses server.py with Postgres checkpointing instead
-app = workflow.compile()
+app = compile_graph()
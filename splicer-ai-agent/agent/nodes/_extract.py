@@ -0,0 +1,27 @@
+"""
+Tool-output extraction shared by agent nodes that read their own tool results
+(source_agent's copy calls, paster_agent's paste calls).
+"""
+
+from typing import Any, List, Sequence
+from langchain_core.messages import AIMessage, AnyMessage, ToolMessage
+from components.serialization import json_loads
+
+
+def extract_tool_outputs(messages: Sequence[AnyMessage], tool_name: str) -> List[Any]:
+    """
+    Decode the JSON results of every `tool_name` call in an agent run, in call order.
+    
+    Walks messages once, collecting matching tool-call ids from AIMessages and
+    string contents from ToolMessages; calls without a result are skipped.
+    """
+    call_ids = []
+    content_by_id = {}
+    for msg in messages:
+        if isinstance(msg, AIMessage):
+            for tool_call in msg.tool_calls:
+                if tool_call.get("name") == tool_name:
+                    call_ids.append(tool_call.get("id"))
+        elif isinstance(msg, ToolMessage) and isinstance(msg.content, str):
+            content_by_id[msg.tool_call_id] = msg.content
+    return [json_loads(content_by_id[i]) for i in call_ids if i in content_by_id]
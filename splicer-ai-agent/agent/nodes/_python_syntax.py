@@ -0,0 +1,27 @@
+"""
+Python syntax check used by the check node, inline or in its process pool.
+
+Kept free of heavy imports: pool workers import this module to run
+compile_check, so it must not pull in LangGraph or the agent stack.
+"""
+
+from typing import List, Tuple
+
+
+def check_python_syntax(content: str, file_path: str) -> List[str]:
+    """
+    Check Python syntax by attempting to compile.
+    """
+    errors = []
+    try:
+        compile(content, file_path, 'exec')
+    except SyntaxError as e:
+        errors.append(f"Python syntax error at line {e.lineno}: {e.msg}")
+    return errors
+
+
+def compile_check(file_path: str, content: str) -> Tuple[str, List[str]]:
+    """
+    Top-level (picklable) wrapper around check_python_syntax for process pools.
+    """
+    return file_path, check_python_syntax(content, file_path)
@@ -5,12 +5,25 @@ This node runs programmatically before the validator agent, storing results
 in state for the validator to analyze.
 """
 
+import asyncio
 import json
+import logging
+import multiprocessing
+import os
 import re
-from typing import Any, Dict, List, Tuple
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from langgraph.config import get_stream_writer
 from agent.state import AgentState
-from components.github_mcp import github_session, get_token_from_config
+from agent.nodes._python_syntax import (
+    check_python_syntax as _check_python_syntax,
+    compile_check as _compile_check,
+)
+from components.github_mcp import github_tools, get_token_from_config, github_graphql, parse_repo
+from components.serialization import json_loads
+
+logger = logging.getLogger(__name__)
 
 
 # Patterns for import extraction
@@ -21,7 +34,7 @@ _IMPORT_PATTERN = re.compile(
 )
 
 # Node.js built-in modules (not npm packages)
-_NODE_BUILTINS = {"fs", "path", "url", "crypto", "os", "util", "http", "https", "stream", "events", "buffer"}
+_NODE_BUILTINS = frozenset({"fs", "path", "url", "crypto", "os", "util", "http", "https", "stream", "events", "buffer"})
 
 # File extensions by language category
 _JS_TS_EXTENSIONS = (".js", ".jsx", ".ts", ".tsx", ".mjs", ".cjs")
@@ -29,72 +42,71 @@ _JSON_EXTENSIONS = (".json",)
 _PYTHON_EXTENSIONS = (".py", ".pyw")
 _YAML_EXTENSIONS = (".yaml", ".yml")
 
+# Python compile checks go to a process pool only for batches large enough to
+# outweigh pickling and the worker round-trip; typical changesets compile inline
+_PYTHON_POOL_MIN_FILES = 4
+_PYTHON_POOL_MIN_BYTES = 256 * 1024
+_PYTHON_POOL_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# Created on first use and shut down by close_python_check_pool(). Workers start via
+# forkserver (spawn where unavailable): forking the multithreaded server process
+# could copy locks held by other threads into the children.
+_python_pool: Optional[ProcessPoolExecutor] = None
+
+# Comments and string/template literals, each blanked out before bracket/JSX checks.
+# Closing delimiters are optional so unterminated literals are consumed the same
+# way a parser would (strings stop at end of line, templates at EOF). An unterminated
+# block comment stops one character short of EOF, which is then scanned as code.
+_STRIP_PATTERN = re.compile(
+    r'''//[^\n]*'''
+    r'''|/\*[\s\S]*?(?:\*/|(?=[\s\S]\Z)|\Z)'''
+    r'''|`(?:\\[\s\S]?|[^`\\])*`?'''
+    r'''|"(?:\\[\s\S]?|[^"\\\n])*"?'''
+    r'''|'(?:\\[\s\S]?|[^'\\\n])*'?'''
+)
+_NON_NEWLINE = re.compile(r'[^\n]')
+_ESCAPE = re.compile(r'\\[\s\S]')
+
+
+def _blank_match(match: "re.Match[str]") -> str:
+    """
+    Blank out a comment or literal, keeping newlines and comment delimiters.
+    Escape sequences (even an escaped newline) become two spaces.
+    """
+    text = match.group(0)
+    if text[0] == '/':
+        if text[1] == '*' and len(text) >= 4 and text.endswith('*/'):
+            return '/*' + _NON_NEWLINE.sub(' ', text[2:-2]) + '*/'
+        return text[:2] + _NON_NEWLINE.sub(' ', text[2:])
+    return _NON_NEWLINE.sub(' ', _ESCAPE.sub('  ', text))
+
+
 def _strip_strings_and_comments(content: str, is_jsx: bool = False) -> str:
     """
     Replace string literals and comments with whitespace to avoid false positives
     in bracket matching. Preserves line structure for error reporting.
     """
-    result = []
-    i = 0
-    n = len(content)
-    
-    while i < n:
-        # Single-line comment
-        if content[i:i+2] == '//':
-            result.append('//')
-            i += 2
-            while i < n and content[i] != '\n':
-                result.append(' ')
-                i += 1
-        # Multi-line comment
-        elif content[i:i+2] == '/*':
-            result.append('/*')
-            i += 2
-            while i < n - 1 and content[i:i+2] != '*/':
-                result.append(' ' if content[i] != '\n' else '\n')
-                i += 1
-            if i < n - 1:
-                result.append('*/')
-                i += 2
-        # Template literal
-        elif content[i] == '`':
-            result.append(' ')
-            i += 1
-            while i < n and content[i] != '`':
-                if content[i] == '\\' and i + 1 < n:
-                    result.append('  ')
-                    i += 2
-                elif content[i] == '\n':
-                    result.append('\n')
-                    i += 1
-                else:
-                    result.append(' ')
-                    i += 1
-            if i < n:
-                result.append(' ')
-                i += 1
-        # String literals
-        elif content[i] in '"\'':
-            quote = content[i]
-            result.append(' ')
-            i += 1
-            while i < n and content[i] != quote:
-                if content[i] == '\\' and i + 1 < n:
-                    result.append('  ')
-                    i += 2
-                elif content[i] == '\n':
-                    break  # Unterminated string
-                else:
-                    result.append(' ')
-                    i += 1
-            if i < n and content[i] == quote:
-                result.append(' ')
-                i += 1
-        else:
-            result.append(content[i])
-            i += 1
-    
-    return ''.join(result)
+    return _STRIP_PATTERN.sub(_blank_match, content)
+
+
+# Bracket pairs for balance checking
+_BRACKET_PAIRS = {'(': ')', '[': ']', '{': '}'}
+_BRACKET_CLOSERS = {')': '(', ']': '[', '}': '{'}
+_NON_BRACKET = re.compile(r'[^()\[\]{}]+')
+
+
+def _brackets_balanced(content: str) -> bool:
+    """
+    Fast path: check balance over the bracket characters alone.
+    Drops everything else in C so the Python loop only sees brackets.
+    """
+    stack: List[str] = []
+    for char in _NON_BRACKET.sub('', content):
+        if char in _BRACKET_PAIRS:
+            stack.append(_BRACKET_PAIRS[char])
+        elif not stack or stack.pop() != char:
+            return False
+    return not stack
 
 
 def _check_bracket_balance(content: str, file_path: str) -> List[str]:
@@ -102,21 +114,30 @@ def _check_bracket_balance(content: str, file_path: str) -> List[str]:
     Check for balanced brackets, braces, and parentheses.
     Returns list of error messages.
     """
-    errors = []
     stripped = _strip_strings_and_comments(content, file_path.endswith(('.jsx', '.tsx')))
+    return _check_bracket_balance_stripped(stripped, file_path)
+
+
+def _check_bracket_balance_stripped(stripped: str, file_path: str) -> List[str]:
+    """
+    Bracket balance check on content already passed through _strip_strings_and_comments.
+    """
+    errors = []
+    
+    # Valid files (the common case) skip the per-character line/col walk below
+    if _brackets_balanced(stripped):
+        return errors
     
     stack: List[Tuple[str, int, int]] = []  # (char, line, col)
-    pairs = {'(': ')', '[': ']', '{': '}'}
-    closers = {')': '(', ']': '[', '}': '{'}
     
     line = 1
     col = 1
     
     for char in stripped:
-        if char in pairs:
+        if char in _BRACKET_PAIRS:
             stack.append((char, line, col))
-        elif char in closers:
-            expected_opener = closers[char]
+        elif char in _BRACKET_CLOSERS:
+            expected_opener = _BRACKET_CLOSERS[char]
             if not stack:
                 errors.append(f"Unexpected '{char}' at line {line}, col {col}")
             elif stack[-1][0] != expected_opener:
@@ -141,28 +162,52 @@ def _check_bracket_balance(content: str, file_path: str) -> List[str]:
     return errors
 
 
+_NEWLINE = re.compile(r'\n')
+
+
+def _line_numbers(text: str, positions: List[int]) -> List[int]:
+    """
+    Map character offsets in text to 1-based line numbers.
+    Builds the newline index once (only if there is something to look up) and bisects per offset.
+    """
+    if not positions:
+        return []
+    newlines = [m.start() for m in _NEWLINE.finditer(text)]
+    return [bisect_left(newlines, pos) + 1 for pos in positions]
+
+
+# Closing JSX tag followed by invalid character (like the stray period)
+# Matches: </tag>. or </tag>, or />. or />,
+_JSX_INVALID_AFTER_TAG = re.compile(r'(?:<\/[a-zA-Z][a-zA-Z0-9]*\s*>|\/\s*>)\s*([.,])\s*(?=\)|;|\n|$)')
+# Obviously broken JSX: opening < without proper closure on same logical unit
+# This is a heuristic - catches things like: <div<
+_JSX_BROKEN_TAG = re.compile(r'<([a-zA-Z][a-zA-Z0-9]*)[^>]*<(?![!/])')
+# Standalone trailing period (not part of number, property access, or spread), any line
+_TRAILING_DOT = re.compile(r'(?<![0-9a-zA-Z_$\]\)])(?<!\.\.)\.[^\S\n]*$', re.MULTILINE)
+
+
 def _check_jsx_syntax(content: str, file_path: str) -> List[str]:
     """
     Check for common JSX/TSX syntax errors.
     """
-    errors = []
     stripped = _strip_strings_and_comments(content, is_jsx=True)
+    return _check_jsx_syntax_stripped(stripped, file_path)
+
+
+def _check_jsx_syntax_stripped(stripped: str, file_path: str) -> List[str]:
+    """
+    JSX/TSX syntax check on content already passed through _strip_strings_and_comments.
+    """
+    errors = []
     
-    # Pattern: closing JSX tag followed by invalid character (like the stray period)
-    # Matches: </tag>. or </tag>, or />. or />,
-    invalid_after_tag = re.compile(r'(?:<\/[a-zA-Z][a-zA-Z0-9]*\s*>|\/\s*>)\s*([.,])\s*(?=\)|;|\n|$)')
-    
-    for match in invalid_after_tag.finditer(stripped):
-        char = match.group(1)
-        # Find line number
-        line_num = stripped[:match.start()].count('\n') + 1
-        errors.append(f"Invalid '{char}' after JSX closing tag at line {line_num}")
-    
-    # Check for obviously broken JSX: opening < without proper closure on same logical unit
-    # This is a heuristic - catches things like: <div<
-    broken_tag = re.compile(r'<([a-zA-Z][a-zA-Z0-9]*)[^>]*<(?![!/])')
-    for match in broken_tag.finditer(stripped):
-        line_num = stripped[:match.start()].count('\n') + 1
+    invalid_after_tag = list(_JSX_INVALID_AFTER_TAG.finditer(stripped))
+    broken_tags = list(_JSX_BROKEN_TAG.finditer(stripped))
+    line_nums = _line_numbers(stripped, [m.start() for m in (*invalid_after_tag, *broken_tags)])
+    
+    for match, line_num in zip(invalid_after_tag, line_nums):
+        errors.append(f"Invalid '{match.group(1)}' after JSX closing tag at line {line_num}")
+    
+    for match, line_num in zip(broken_tags, line_nums[len(invalid_after_tag):]):
         errors.append(f"Malformed JSX tag '<{match.group(1)}' at line {line_num}")
     
     return errors
@@ -172,75 +217,115 @@ def _check_trailing_syntax(content: str, file_path: str) -> List[str]:
     """
     Check for trailing syntax errors common in JS/TS.
     """
-    errors = []
-    lines = content.split('\n')
-    
-    for i, line in enumerate(lines, 1):
-        stripped_line = line.rstrip()
-        if not stripped_line:
-            continue
-        
-        # Check for trailing operators that suggest incomplete expressions
-        # But exclude valid cases like line continuation
-        if re.search(r'[+\-*/]\s*$', stripped_line) and not stripped_line.endswith('++') and not stripped_line.endswith('--'):
-            # Could be multiline expression, just warn
-            pass
-        
-        # Standalone period (not part of number, property access, or spread)
-        if re.search(r'(?<![0-9a-zA-Z_$\]\)])\.\s*$', stripped_line):
-            if not re.search(r'\.\.\.$', stripped_line):  # Exclude spread operator
-                errors.append(f"Suspicious trailing '.' at line {i}")
+    # One scan over the whole file; line numbers are only computed for hits
+    matches = list(_TRAILING_DOT.finditer(content))
+    line_nums = _line_numbers(content, [m.start() for m in matches])
+    return [f"Suspicious trailing '.' at line {line_num}" for line_num in line_nums]
+
+
+def _get_python_pool() -> ProcessPoolExecutor:
+    """Return the shared compile-check pool, creating it on first use."""
+    global _python_pool
+    if _python_pool is None:
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _python_pool = ProcessPoolExecutor(
+            max_workers=_PYTHON_POOL_MAX_WORKERS,
+            mp_context=multiprocessing.get_context(start_method),
+        )
+    return _python_pool
+
+
+async def close_python_check_pool() -> None:
+    """Shut down the compile-check pool, if it was started (call once at process shutdown)."""
+    global _python_pool
+    if _python_pool is not None:
+        pool, _python_pool = _python_pool, None
+        # shutdown(wait=True) blocks until workers exit; keep it off the event loop
+        await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+
+
+async def _check_python_files(python_files: Dict[str, str]) -> Dict[str, List[str]]:
+    """
+    Compile Python files, using the shared process pool for large batches so the
+    CPU-bound work runs across cores and off the event loop thread.
+    """
+    total_bytes = sum(len(content) for content in python_files.values())
+    if len(python_files) < _PYTHON_POOL_MIN_FILES or total_bytes < _PYTHON_POOL_MIN_BYTES:
+        return {
+            path: _check_python_syntax(content, path)
+            for path, content in python_files.items()
+        }
     
-    return errors
+    loop = asyncio.get_running_loop()
+    executor = _get_python_pool()
+    results = await asyncio.gather(*(
+        loop.run_in_executor(executor, _compile_check, path, content)
+        for path, content in python_files.items()
+    ))
+    return dict(results)
 
 
-def _check_python_syntax(content: str, file_path: str) -> List[str]:
+def _check_js_ts_syntax(content: str, file_path: str) -> List[str]:
     """
-    Check Python syntax by attempting to compile.
+    Run bracket, JSX (for .jsx/.tsx) and trailing-syntax checks on JS/TS content.
     """
     errors = []
-    try:
-        compile(content, file_path, 'exec')
-    except SyntaxError as e:
-        errors.append(f"Python syntax error at line {e.lineno}: {e.msg}")
+    # Strip once and share between the bracket and JSX checks
+    is_jsx = file_path.endswith(('.jsx', '.tsx'))
+    stripped = _strip_strings_and_comments(content, is_jsx)
+    errors.extend(_check_bracket_balance_stripped(stripped, file_path))
+    if is_jsx:
+        errors.extend(_check_jsx_syntax_stripped(stripped, file_path))
+    errors.extend(_check_trailing_syntax(content, file_path))
     return errors
 
 
+def _check_json_syntax(content: str, file_path: str) -> List[str]:
+    """
+    Check JSON syntax by attempting to parse.
+    """
+    try:
+        json_loads(content)
+    except json.JSONDecodeError as e:
+        return [f"JSON syntax error at line {e.lineno}: {e.msg}"]
+    return []
+
+
+def _check_yaml_syntax(content: str, file_path: str) -> List[str]:
+    """
+    Basic YAML validation - check for tab indentation (invalid in YAML).
+    """
+    for i, line in enumerate(content.split('\n'), 1):
+        if line.startswith('\t'):
+            return [f"YAML error at line {i}: tabs not allowed for indentation"]
+    return []
+
+
+# Syntax checker by file extension (built once from the extension groups above)
+_SYNTAX_CHECKERS: Dict[str, Callable[[str, str], List[str]]] = {
+    **dict.fromkeys(_JS_TS_EXTENSIONS, _check_js_ts_syntax),
+    **dict.fromkeys(_PYTHON_EXTENSIONS, _check_python_syntax),
+    **dict.fromkeys(_JSON_EXTENSIONS, _check_json_syntax),
+    **dict.fromkeys(_YAML_EXTENSIONS, _check_yaml_syntax),
+}
+
+
 def _validate_syntax(content: str, file_path: str) -> List[str]:
     """
     Validate syntax based on file type. Returns list of error messages.
     """
-    errors = []
-    
-    if file_path.endswith(_JS_TS_EXTENSIONS):
-        errors.extend(_check_bracket_balance(content, file_path))
-        if file_path.endswith(('.jsx', '.tsx')):
-            errors.extend(_check_jsx_syntax(content, file_path))
-        errors.extend(_check_trailing_syntax(content, file_path))
-    
-    elif file_path.endswith(_PYTHON_EXTENSIONS):
-        errors.extend(_check_python_syntax(content, file_path))
-    
-    elif file_path.endswith(_JSON_EXTENSIONS):
-        try:
-            json.loads(content)
-        except json.JSONDecodeError as e:
-            errors.append(f"JSON syntax error at line {e.lineno}: {e.msg}")
-    
-    elif file_path.endswith(_YAML_EXTENSIONS):
-        # Basic YAML validation - check for tab indentation (invalid in YAML)
-        for i, line in enumerate(content.split('\n'), 1):
-            if line.startswith('\t'):
-                errors.append(f"YAML error at line {i}: tabs not allowed for indentation")
-                break
-    
-    return errors
+    checker = _SYNTAX_CHECKERS.get(os.path.splitext(os.path.basename(file_path))[1])
+    if checker is None:
+        return []
+    return checker(content, file_path)
 
 
-def _extract_imports(content: str) -> List[str]:
-    """Extract import paths from JS/TS content."""
-    matches = _IMPORT_PATTERN.findall(content)
-    return [m[0] or m[1] for m in matches if m[0] or m[1]]
+def _extract_imports(content: str) -> Iterator[str]:
+    """Extract import paths from JS/TS content, yielding them as they are matched."""
+    for match in _IMPORT_PATTERN.finditer(content):
+        path = match.group(1) or match.group(2)
+        if path:
+            yield path
 
 
 def _extract_content_from_mcp_result(result: Any) -> str:
@@ -279,23 +364,103 @@ async def _read_file(
         return {"success": False, "error": str(e), "path": path}
 
 
+async def _read_files_graphql(
+    token: str, owner: str, repo: str, paths: List[str], ref: str
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Read several files in a single GitHub GraphQL request using aliased
+    repository.object(expression: "ref:path") lookups.
+    
+    Returns results keyed by path in the same shape as _read_file. Paths GraphQL
+    cannot serve as text (binary, truncated, or not a blob) are left out so the
+    caller can fall back to the MCP tool for them.
+    """
+    variables: Dict[str, str] = {"owner": owner, "name": repo}
+    params = []
+    fields = []
+    for i, path in enumerate(paths):
+        variables[f"e{i}"] = f"{ref}:{path}"
+        params.append(f"$e{i}: String!")
+        fields.append(f"f{i}: object(expression: $e{i}) {{ ... on Blob {{ text isTruncated }} }}")
+    query = (
+        f"query($owner: String!, $name: String!, {', '.join(params)}) {{ "
+        f"repository(owner: $owner, name: $name) {{ {' '.join(fields)} }} }}"
+    )
+    
+    repository = (await github_graphql(token, query, variables)).get("repository")
+    if repository is None:
+        raise ValueError(f"Repository {owner}/{repo} not returned by GraphQL")
+    
+    results: Dict[str, Dict[str, Any]] = {}
+    for i, path in enumerate(paths):
+        blob = repository.get(f"f{i}")
+        if blob is None:
+            results[path] = {"success": False, "error": "File not found", "path": path}
+        elif blob.get("text") is None or blob.get("isTruncated"):
+            continue
+        elif blob["text"]:
+            results[path] = {"success": True, "content": blob["text"], "path": path}
+        else:
+            results[path] = {"success": False, "error": "Empty response from GitHub", "path": path}
+    return results
+
+
+async def _read_files(
+    get_file_contents: Any, owner: str, repo: str, paths: List[str], ref: str,
+    token: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Read many files from GitHub, returning _read_file results in path order.
+    
+    With a token, all paths are requested in one GraphQL round-trip. Anything
+    GraphQL could not serve (or every path, if the request fails) is read with
+    concurrent get_file_contents MCP calls.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    if token and paths:
+        try:
+            results = await _read_files_graphql(token, owner, repo, paths, ref)
+        except Exception as e:
+            logger.debug(f"GraphQL batch read failed, falling back to MCP reads: {e}")
+    
+    remaining = [path for path in dict.fromkeys(paths) if path not in results]
+    fetched = await asyncio.gather(*(
+        _read_file(get_file_contents, owner, repo, path, ref)
+        for path in remaining
+    ))
+    for result in fetched:
+        results[result["path"]] = result
+    return [results[path] for path in paths]
+
+
 async def _run_check(
     get_file_contents: Any,
     owner: str,
     repo: str,
     branch: str,
     changeset: List[str],
+    token: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Core check logic - validates files by reading them directly.
     
     Checks performed:
-    1. Changeset files exist and are readable
+    1. Changeset files exist and are readable (one GraphQL batch read when a token is given)
     2. package.json is valid JSON (extracts dependencies)
     3. tsconfig.json is valid JSON
     4. npm dependencies referenced in imports exist in package.json
     5. Syntax validation (brackets, JSX, Python compile, JSON/YAML)
+    
+    An empty changeset has nothing to validate and returns without any reads.
     """
+    if not changeset:
+        return {
+            "errors": [],
+            "warnings": ["Empty changeset"],
+            "checks_performed": [],
+            "passed": True
+        }
+    
     writer = get_stream_writer()
     errors: List[str] = []
     warnings: List[str] = []
@@ -304,30 +469,35 @@ async def _run_check(
     writer(f"Validating {owner}/{repo} branch:{branch}")
     
     # 1. Verify changeset files exist by trying to read them
+    # package.json / tsconfig.json are fetched in the same batch unless already in the changeset
+    config_paths = [p for p in ("package.json", "tsconfig.json") if p not in changeset]
+    results = await _read_files(
+        get_file_contents, owner, repo, [*changeset, *config_paths], branch, token=token
+    )
+    
     readable_files: Dict[str, str] = {}
-    for file_path in changeset:
-        result = await _read_file(get_file_contents, owner, repo, file_path, branch)
+    for result in results[:len(changeset)]:
         if result["success"]:
             readable_files[result["path"]] = result["content"]
         else:
             errors.append(f"Cannot read '{result['path']}': {result['error']}")
     checks_performed.append("changeset_files_exist")
     
+    config_files: Dict[str, str] = {
+        result["path"]: result["content"]
+        for result in results[len(changeset):]
+        if result["success"]
+    }
+    
     # 2. Validate and parse package.json (reuse if already fetched)
-    all_deps: set = set()
-    if "package.json" in readable_files:
-        pkg_content = readable_files["package.json"]
-        pkg_success = True
-    else:
-        pkg_result = await _read_file(get_file_contents, owner, repo, "package.json", branch)
-        pkg_success = pkg_result["success"]
-        pkg_content = pkg_result.get("content", "")
+    all_deps: frozenset = frozenset()
+    pkg_content = readable_files.get("package.json") or config_files.get("package.json")
     
-    if pkg_success:
+    if pkg_content:
         try:
-            pkg_data = json.loads(pkg_content)
-            all_deps = set(pkg_data.get("dependencies", {}).keys()) | \
-                       set(pkg_data.get("devDependencies", {}).keys())
+            pkg_data = json_loads(pkg_content)
+            all_deps = frozenset(pkg_data.get("dependencies", {})) | \
+                       frozenset(pkg_data.get("devDependencies", {}))
             checks_performed.append("package_json_valid")
         except json.JSONDecodeError as e:
             errors.append(f"Invalid package.json: {str(e)}")
@@ -335,17 +505,11 @@ async def _run_check(
         warnings.append("No package.json found (may not be a JS/TS project)")
     
     # 3. Validate tsconfig.json (reuse if already fetched)
-    if "tsconfig.json" in readable_files:
-        ts_content = readable_files["tsconfig.json"]
-        ts_success = True
-    else:
-        ts_result = await _read_file(get_file_contents, owner, repo, "tsconfig.json", branch)
-        ts_success = ts_result["success"]
-        ts_content = ts_result.get("content", "")
+    ts_content = readable_files.get("tsconfig.json") or config_files.get("tsconfig.json")
     
-    if ts_success:
+    if ts_content:
         try:
-            json.loads(ts_content)
+            json_loads(ts_content)
             checks_performed.append("tsconfig_valid")
         except json.JSONDecodeError as e:
             errors.append(f"Invalid tsconfig.json: {str(e)}")
@@ -353,10 +517,12 @@ async def _run_check(
     # 4. Check npm dependencies in changeset files
     # Missing dependencies are errors (they prevent the app from running)
     missing_deps: set = set()
+    known_deps = all_deps | _NODE_BUILTINS
     js_ts_files = [f for f in changeset if f.endswith(_JS_TS_EXTENSIONS)]
     for file_path in js_ts_files:
         content = readable_files.get(file_path)
-        if not content:
+        # Without a dependency list there is nothing to compare imports against
+        if not content or not all_deps:
             continue
         
         for imp in _extract_imports(content):
@@ -364,24 +530,34 @@ async def _run_check(
             if imp.startswith(".") or imp.startswith("@/"):
                 continue
             
-            # Extract npm package name
+            # Extract npm package name (up to the second slash for @org/package)
             if imp.startswith("@"):
-                pkg_name = "/".join(imp.split("/")[:2])  # @org/package
+                end = imp.find("/", imp.find("/") + 1)
             else:
-                pkg_name = imp.split("/")[0]
+                end = imp.find("/")
+            pkg_name = imp if end < 0 else imp[:end]
             
-            if all_deps and pkg_name not in all_deps and pkg_name not in _NODE_BUILTINS:
-                if pkg_name not in missing_deps:
-                    missing_deps.add(pkg_name)
-                    errors.append(f"Missing dependency '{pkg_name}' imported in {file_path}")
+            if pkg_name not in known_deps and pkg_name not in missing_deps:
+                missing_deps.add(pkg_name)
+                errors.append(f"Missing dependency '{pkg_name}' imported in {file_path}")
     
     if js_ts_files:
         checks_performed.append("npm_dependency_check")
     
     # 5. Syntax validation for all readable files
+    # Python files are compiled up front as one batch; the rest are checked inline
+    python_errors = await _check_python_files({
+        path: content
+        for path, content in readable_files.items()
+        if path.endswith(_PYTHON_EXTENSIONS)
+    })
+    
     syntax_errors_found = False
     for file_path, content in readable_files.items():
-        syntax_errs = _validate_syntax(content, file_path)
+        if file_path in python_errors:
+            syntax_errs = python_errors[file_path]
+        else:
+            syntax_errs = _validate_syntax(content, file_path)
         for err in syntax_errs:
             errors.append(f"{file_path}: {err}")
             syntax_errors_found = True
@@ -409,21 +585,21 @@ async def check_node(state: AgentState, config) -> dict:
     branch = state.get("branch", "splice")
     changeset = state.get("changeset", [])
     
-    if "/" not in target_repo:
+    try:
+        owner, repo = parse_repo(target_repo)
+    except ValueError as e:
         return {
             "check_output": {
-                "errors": [f"Invalid target_repo format: {target_repo}"],
+                "errors": [str(e)],
                 "warnings": [],
                 "checks_performed": [],
                 "passed": False
             }
         }
     
-    owner, repo = target_repo.split("/", 1)
-    
     try:
         token = get_token_from_config(config)
-        async with github_session(token) as mcp_tools:
+        async with github_tools(config) as mcp_tools:
             get_file_contents = next(
                 (t for t in mcp_tools if t.name == "get_file_contents"),
                 None
@@ -445,6 +621,7 @@ async def check_node(state: AgentState, config) -> dict:
                 repo=repo,
                 branch=branch,
                 changeset=changeset,
+                token=token,
             )
         return {"check_output": check_output}
     except Exception as e:
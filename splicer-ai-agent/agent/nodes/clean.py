@@ -7,11 +7,22 @@ TODO: Add final migration summary/report.
 import json
 import logging
 from typing import Any, List
+import anyio
 from agent.state import AgentState
-from components.github_mcp import github_session, get_token_from_config
+from components.github_mcp import github_graphql, github_tools, get_token_from_config, parse_repo
 
 logger = logging.getLogger(__name__)
 
+_HEAD_OID_QUERY = (
+    "query($owner: String!, $name: String!, $ref: String!) "
+    "{ repository(owner: $owner, name: $name) { ref(qualifiedName: $ref) { target { oid } } } }"
+)
+
+_DELETE_FILES_MUTATION = (
+    "mutation($input: CreateCommitOnBranchInput!) "
+    "{ createCommitOnBranch(input: $input) { commit { oid } } }"
+)
+
 
 async def _list_splicer_directory(tool: Any, owner: str, repo: str, ref: str) -> List[str]:
     """List files in .splicer/ directory. Returns list of file paths."""
@@ -19,6 +30,9 @@ async def _list_splicer_directory(tool: Any, owner: str, repo: str, ref: str) ->
         result = await tool.ainvoke({
             "owner": owner, "repo": repo, "path": ".splicer", "ref": ref
         })
+    except anyio.ClosedResourceError:
+        # Session is gone, not the directory; let the caller reopen one
+        raise
     except Exception as e:
         logger.debug(f"No .splicer/ directory found or error listing: {e}")
         return []
@@ -48,38 +62,90 @@ async def _delete_splicer_file(tool: Any, owner: str, repo: str, branch: str, pa
         })
         logger.info(f"Deleted {path}")
         return True
+    except anyio.ClosedResourceError:
+        # Session is gone; let the caller reopen one instead of logging a failure
+        raise
     except Exception as e:
         logger.warning(f"Failed to delete {path}: {e}")
         return False
 
 
+async def _delete_in_one_commit(token: str, owner: str, repo: str, branch: str, paths: List[str]) -> bool:
+    """
+    Delete all paths in a single commit with GraphQL createCommitOnBranch.
+    Returns False if that failed (e.g. the branch moved since its head was read);
+    nothing was deleted then, and the caller falls back to per-file deletes.
+    """
+    try:
+        data = await github_graphql(token, _HEAD_OID_QUERY, {
+            "owner": owner, "name": repo, "ref": f"refs/heads/{branch}"
+        })
+        ref = (data.get("repository") or {}).get("ref") or {}
+        head_oid = (ref.get("target") or {}).get("oid")
+        if not head_oid:
+            return False
+        data = await github_graphql(token, _DELETE_FILES_MUTATION, {"input": {
+            "branch": {"repositoryNameWithOwner": f"{owner}/{repo}", "branchName": branch},
+            "message": {"headline": "Splicer: Remove .splicer/"},
+            "fileChanges": {"deletions": [{"path": path} for path in paths]},
+            "expectedHeadOid": head_oid,
+        }})
+    except Exception as e:
+        logger.debug(f"Single-commit delete failed, deleting file by file: {e}")
+        return False
+    if not (data.get("createCommitOnBranch") or {}).get("commit"):
+        return False
+    for path in paths:
+        logger.info(f"Deleted {path}")
+    return True
+
+
+async def _delete_splicer_files(tool: Any, owner: str, repo: str, branch: str, paths: List[str]) -> None:
+    """
+    Delete files from .splicer/ one at a time (fallback for _delete_in_one_commit).
+    Each delete is its own commit on the branch, so concurrent deletes would race
+    to update the branch ref. Raises anyio.ClosedResourceError if the MCP session
+    closed underneath us.
+    """
+    for path in paths:
+        await _delete_splicer_file(tool, owner, repo, branch, path)
+
+
+async def _clean_splicer_directory(config, owner: str, repo: str, branch: str, fresh: bool = False) -> None:
+    """
+    List .splicer/ files in one session and delete them in a single commit, or one
+    by one in that session if the single commit fails.
+    Raises anyio.ClosedResourceError if the MCP session closed underneath us.
+    """
+    async with github_tools(config, fresh=fresh) as mcp_tools:
+        get_file_contents = next((t for t in mcp_tools if t.name == "get_file_contents"), None)
+        delete_file = next((t for t in mcp_tools if t.name == "delete_file"), None)
+        if not get_file_contents or not delete_file:
+            return
+        files = await _list_splicer_directory(get_file_contents, owner, repo, branch)
+        if not files:
+            return
+        if await _delete_in_one_commit(get_token_from_config(config), owner, repo, branch, files):
+            return
+        await _delete_splicer_files(delete_file, owner, repo, branch, files)
+
+
 async def clean_up(state: AgentState, config) -> dict:
     """Delete .splicer/ directory if it exists. Returns empty dict."""
     target_repo = state.get("target_repo", "")
     branch = state.get("branch", "splice")
     
-    if "/" not in target_repo:
+    try:
+        owner, repo = parse_repo(target_repo)
+    except ValueError:
         return {}
     
-    owner, repo = target_repo.split("/", 1)
-    token = get_token_from_config(config)
-
-    # Use a fresh session for listing to avoid ClosedResourceError (session can close after first use)
-    async with github_session(token) as mcp_tools:
-        get_file_contents = next((t for t in mcp_tools if t.name == "get_file_contents"), None)
-        if not get_file_contents:
-            return {}
-        files = await _list_splicer_directory(get_file_contents, owner, repo, branch)
-
-    if not files:
-        return {}
-
-    # Use a fresh session for deletes so we never use a tool after its session may have closed
-    async with github_session(token) as mcp_tools:
-        delete_file = next((t for t in mcp_tools if t.name == "delete_file"), None)
-        if not delete_file:
-            return {}
-        for path in files:
-            await _delete_splicer_file(delete_file, owner, repo, branch, path)
-
+    try:
+        await _clean_splicer_directory(config, owner, repo, branch)
+    except anyio.ClosedResourceError:
+        # The error escaped the session block, so the dead session was released as
+        # failed. Retry in a fresh, unshared session; re-listing skips files already deleted.
+        logger.debug("MCP session closed during cleanup; retrying in a fresh session")
+        await _clean_splicer_directory(config, owner, repo, branch, fresh=True)
+    
     return {}
@@ -1,65 +1,157 @@
-from langchain.agents import create_agent
-from langchain.agents.structured_output import ToolStrategy
-from langchain.agents.middleware import ToolRetryMiddleware, TodoListMiddleware
+from typing import Any, Dict, List
 from agent.state import AgentState
-from components.model import get_model
-from components.responses import IntegratorResponse
 from components.system_prompts.integrator_prompt import INTEGRATOR_PROMPT
-from components.tools import dependency, handle_tool_errors
-from components.github_mcp import github_session, get_token_from_config, INTEGRATOR_AGENT_TOOLS
+from components.github_mcp import github_tools, filter_tools, INTEGRATOR_AGENT_TOOLS
+from components.responses import to_json
+
+
+_CONTEXT_TEMPLATE = """Target Repository: {target_repo}
+Branch: {branch}
+
+## Integration Instructions (from Planner)
+{integration_instructions}
+
+## Source Context
+Summary: {source_summary}
+Metadata: {source_metadata}
+
+## Target Context
+Summary: {target_summary}
+Metadata: {target_metadata}
+Target Paths: {target_path}
+
+## Target Integration Instructions
+{target_integration_instructions}
+
+## Components to Replace
+{components_to_replace}
+
+## Pasted Files (metadata)
+{pasted_files}
+
+## Copied Files (original source content)
+{copied_files}"""
+
+# State keys rendered into the context, with the fallback used when a key is missing
+_CONTEXT_DEFAULTS = {
+    "integration_instructions": "No specific instructions",
+    "source_summary": [],
+    "source_metadata": {},
+    "target_summary": [],
+    "target_metadata": {},
+    "target_path": [],
+    "target_integration_instructions": "No specific instructions",
+    "pasted_files": [],
+    "copied_files": [],
+}
+
+# Structured values are rendered as compact JSON rather than Python repr
+_JSON_KEYS = (
+    "source_summary", "source_metadata", "target_summary", "target_metadata",
+    "target_path", "pasted_files", "copied_files",
+)
+
+
+# Per-file cap on source content in the prompt; the integrator can read full files with get_file_contents
+_MAX_FILE_CHARS = 20_000
+
+
+def _prune_copied_files(copied_files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Shrink copied_files for the prompt: drop exact repeats, point files with
+    duplicate content at the first copy, and truncate oversized contents.
+    """
+    pruned = []
+    first_path_by_content: Dict[str, str] = {}
+    for file in copied_files:
+        path = file.get("path", "")
+        content = file.get("content", "")
+        first_path = first_path_by_content.get(content) if content else None
+        if first_path is None:
+            first_path_by_content[content] = path
+            if len(content) > _MAX_FILE_CHARS:
+                file = {**file, "content": content[:_MAX_FILE_CHARS] + "\n... [truncated]"}
+        elif first_path == path:
+            continue  # Exact repeat of a file already included
+        else:
+            file = {**file, "content": f"[same content as {first_path}]"}
+        pruned.append(file)
+    return pruned
+
+
+def _dedupe(items: List[Any]) -> List[Any]:
+    """Drop repeated entries while keeping first-seen order."""
+    unique = []
+    for item in items:
+        if item not in unique:
+            unique.append(item)
+    return unique
+
+
+def _build_context(state: AgentState) -> str:
+    """Render the integrator's user message from a single snapshot of state."""
+    values = {key: state.get(key, default) for key, default in _CONTEXT_DEFAULTS.items()}
+    values["copied_files"] = _prune_copied_files(values["copied_files"] or [])
+    values["pasted_files"] = _dedupe(values["pasted_files"] or [])
+    values["source_summary"] = _dedupe(values["source_summary"] or [])
+    for key in _JSON_KEYS:
+        values[key] = to_json(values[key])
+    values["target_repo"] = state["target_repo"]
+    values["branch"] = state["branch"]
+    components_to_replace = state.get("components_to_replace")
+    values["components_to_replace"] = (
+        to_json(components_to_replace) if components_to_replace
+        else "None - add new component alongside existing ones"
+    )
+    return _CONTEXT_TEMPLATE.format_map(values)
 
 
 async def integrator_agent(state: AgentState, config) -> dict:
     """Adapt pasted code to work within the target repository."""
-    token = get_token_from_config(config)
-    async with github_session(token) as mcp_tools:
+    from langchain.agents import create_agent
+    from langchain.agents.structured_output import ToolStrategy
+    from langchain.agents.middleware import TodoListMiddleware
+    from components.model import get_model
+    from components.responses import IntegratorResponse
+    from components.tools import (
+        dependency, dependencies, read_files, FileReaderContext, handle_tool_errors, retry_tool_calls,
+    )
+    from components.blobs import hydrate_files
+    
+    # Source contents go into the prompt, so restore any stored as blob hashes
+    copied_files = await hydrate_files(state.get("copied_files") or [], state.get("cache_scope"))
+    
+    async with github_tools(config) as mcp_tools:
         # Filter to integrator agent tools
-        filtered_tools = [t for t in mcp_tools if t.name in INTEGRATOR_AGENT_TOOLS]
+        filtered_tools = filter_tools(mcp_tools, INTEGRATOR_AGENT_TOOLS)
+        
+        # read_files fans out get_file_contents calls for known paths
+        get_file_contents_tool = next(
+            (t for t in filtered_tools if t.name == "get_file_contents"),
+            None
+        )
         
         agent = create_agent(
             model=get_model(thinking_level="high"),
-            tools=[*filtered_tools, dependency],
+            tools=[*filtered_tools, dependencies, dependency, read_files],
             system_prompt=INTEGRATOR_PROMPT,
             response_format=ToolStrategy(IntegratorResponse),
             state_schema=AgentState,
+            context_schema=FileReaderContext,
             middleware=[
                 TodoListMiddleware(),
-                ToolRetryMiddleware(max_retries=3, backoff_factor=2.0, initial_delay=1.0),
+                retry_tool_calls,
                 handle_tool_errors
             ]
         )
         
         # Build context from state
-        context = f"""Target Repository: {state["target_repo"]}
-        Branch: {state["branch"]}
-
-        ## Integration Instructions (from Planner)
-        {state.get("integration_instructions", "No specific instructions")}
-
-        ## Source Context
-        Summary: {state.get("source_summary", [])}
-        Metadata: {state.get("source_metadata", {})}
-
-        ## Target Context
-        Summary: {state.get("target_summary", [])}
-        Metadata: {state.get("target_metadata", {})}
-        Target Paths: {state.get("target_path", [])}
-
-        ## Target Integration Instructions
-        {state.get("target_integration_instructions", "No specific instructions")}
-
-        ## Components to Replace
-        {state.get("components_to_replace") or "None - add new component alongside existing ones"}
-
-        ## Pasted Files (metadata)
-        {state.get("pasted_files", [])}
-
-        ## Copied Files (original source content)
-        {state.get("copied_files", [])}"""
+        context = _build_context({**state, "copied_files": copied_files})
         
         result = await agent.ainvoke(
             {"messages": [{"role": "user", "content": context}]},
-            config
+            config,
+            context=FileReaderContext(get_file_contents=get_file_contents_tool)
         )
         
         # Extract structured response
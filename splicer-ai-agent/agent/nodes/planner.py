@@ -1,21 +1,50 @@
-from langchain_core.messages import SystemMessage, HumanMessage
-from components.model import get_model
+import time
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Any, Dict, Tuple
 from agent.state import AgentState
-from components.responses import PlannerResponse
 from components.system_prompts.planner_prompt import PLANNER_PROMPT
 
-async def planner_api(state: AgentState):
+# Recent plans keyed by digest of (user scope, user input), so re-runs of the same
+# request skip the LLM call. Entries expire after _PLAN_CACHE_TTL seconds, and a run
+# with config["configurable"]["replan"] set (e.g. a retry after a bad plan) always
+# asks the model again and replaces the entry.
+_PLAN_CACHE: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+_PLAN_CACHE_SIZE = 128
+_PLAN_CACHE_TTL = 600.0
+
+
+def _plan_cache_key(state: AgentState) -> str:
+    """Digest of the requesting user's scope and input; plans are never shared across users."""
+    scope = state.get("cache_scope") or ""
+    return blake2b(f"{scope}\0{state['user_input']}".encode()).hexdigest()
+
+
+async def planner_api(state: AgentState, config) -> dict:
     """
     The Planner Agent acts as the architect of the migration.
     It analyzes the user's request to produce a high-level plan,
     delegating exploration to the Source and Target agents.
     """
+    user_input = state["user_input"]
+    key = _plan_cache_key(state)
+    replan = (config or {}).get("configurable", {}).get("replan", False)
+    
+    cached = _PLAN_CACHE.get(key)
+    if cached is not None:
+        cached_at, plan = cached
+        if not replan and time.monotonic() - cached_at < _PLAN_CACHE_TTL:
+            _PLAN_CACHE.move_to_end(key)
+            return dict(plan)
+        del _PLAN_CACHE[key]
+    
+    from langchain_core.messages import SystemMessage, HumanMessage
+    from components.model import get_model
+    from components.responses import PlannerResponse
     
     model = get_model(thinking_level="low")
     structured_llm = model.with_structured_output(PlannerResponse)
     
-    user_input = state["user_input"]
-    
     messages = [
         SystemMessage(content=PLANNER_PROMPT),
         HumanMessage(content=user_input)
@@ -23,9 +52,13 @@ async def planner_api(state: AgentState):
     
     response = await structured_llm.ainvoke(messages)
     
-    return {
+    plan = {
         "source_exploration": response.source_exploration,
         "target_exploration": response.target_exploration,
         "integration_instructions": response.integration_instructions,
         "end_goal": response.end_goal
     }
+    _PLAN_CACHE[key] = (time.monotonic(), plan)
+    if len(_PLAN_CACHE) > _PLAN_CACHE_SIZE:
+        _PLAN_CACHE.popitem(last=False)
+    return dict(plan)
@@ -4,22 +4,64 @@ Splicer Setup Node - Creates splice branch and prepares environment.
 Future: Add repo_loader for indexing target repo into vector store.
 """
 
+import logging
+import re
+from typing import Optional
 from agent.state import AgentState
-from components.github_mcp import github_session, get_token_from_config
+from components.github_mcp import github_graphql, github_tools, get_token_from_config, parse_repo
+
+logger = logging.getLogger(__name__)
+
+_BRANCH_REF_QUERY = (
+    "query($owner: String!, $name: String!, $ref: String!) "
+    "{ repository(owner: $owner, name: $name) { ref(qualifiedName: $ref) { name } } }"
+)
+
+# GitHub's 422 for an existing ref, as create_branch reports it
+# ("failed to create branch: POST .../git/refs: 422 Reference already exists []")
+_REF_EXISTS_ERROR = re.compile(r"\b422 Reference already exists\b")
+
+
+async def _branch_exists(token: str, owner: str, repo: str, branch: str) -> Optional[bool]:
+    """
+    Look the branch ref up with one GraphQL query.
+    
+    Returns None when the repository is not visible to the token, so the caller
+    falls back to create_branch. Raises whatever github_graphql raises.
+    """
+    data = await github_graphql(token, _BRANCH_REF_QUERY, {
+        "owner": owner, "name": repo, "ref": f"refs/heads/{branch}"
+    })
+    repository = data.get("repository")
+    if repository is None:
+        return None
+    return repository.get("ref") is not None
 
 
 async def splicer_setup(state: AgentState, config) -> dict:
-    """Create splice branch in target repo from default branch if it doesn't exist."""
+    """
+    Create splice branch in target repo from default branch if it doesn't exist.
+    Records the branch in state, so a re-entry later in the same run skips the check.
+    """
     target_repo = state["target_repo"]
     branch = state.get("branch", "splice")
     
-    if "/" not in target_repo:
-        raise ValueError(f"Invalid target_repo format: {target_repo}")
+    owner, repo = parse_repo(target_repo)
+    
+    ensured = f"{owner}/{repo}:{branch}"
+    if state.get("ensured_branch") == ensured:
+        return {}
     
-    owner, repo = target_repo.split("/", 1)
+    # Re-runs reuse the existing branch, so probe before trying to create it
+    try:
+        exists = await _branch_exists(get_token_from_config(config), owner, repo, branch)
+    except Exception as e:
+        logger.debug(f"Branch lookup failed, attempting create_branch: {e}")
+        exists = None
+    if exists:
+        return {"ensured_branch": ensured}
     
-    token = get_token_from_config(config)
-    async with github_session(token) as mcp_tools:
+    async with github_tools(config) as mcp_tools:
         create_branch_tool = next((t for t in mcp_tools if t.name == "create_branch"), None)
         if not create_branch_tool:
             raise ValueError("create_branch tool not available from GitHub MCP")
@@ -31,10 +73,8 @@ async def splicer_setup(state: AgentState, config) -> dict:
                 "branch": branch
             })
         except Exception as e:
-            error_msg = str(e).lower()
-            if "already exists" in error_msg or "reference already exists" in error_msg:
-                pass
-            else:
+            # Created concurrently, or the lookup could not tell
+            if not _REF_EXISTS_ERROR.search(str(e)):
                 raise
-        
-    return {}
+    
+    return {"ensured_branch": ensured}
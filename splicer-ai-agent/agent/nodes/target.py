@@ -1,39 +1,46 @@
-from langchain.agents import create_agent
-from langchain.agents.structured_output import ToolStrategy
-from langchain.agents.middleware import ToolRetryMiddleware
 from agent.state import AgentState
-from components.model import get_model
-from components.responses import TargetResponse
 from components.system_prompts.target_prompt import TARGET_PROMPT
-from components.tools import handle_tool_errors
-from components.github_mcp import github_session, get_token_from_config, TARGET_AGENT_TOOLS
+from components.github_mcp import github_tools, filter_tools, TARGET_AGENT_TOOLS
 
 
 async def target_agent(state: AgentState, config) -> dict:
     """Explore target repository structure and determine integration paths."""
-    token = get_token_from_config(config)
-    async with github_session(token) as mcp_tools:
+    from langchain.agents import create_agent
+    from langchain.agents.structured_output import ToolStrategy
+    from components.model import get_model
+    from components.responses import TargetResponse, to_json
+    from components.tools import read_files, FileReaderContext, handle_tool_errors, retry_tool_calls
+    
+    async with github_tools(config) as mcp_tools:
         # Filter to target agent tools: get_file_contents, search_code, get_repository_tree, search_repositories
-        filtered_tools = [t for t in mcp_tools if t.name in TARGET_AGENT_TOOLS]
+        filtered_tools = filter_tools(mcp_tools, TARGET_AGENT_TOOLS)
+        
+        # read_files fans out get_file_contents calls for known paths
+        get_file_contents_tool = next(
+            (t for t in filtered_tools if t.name == "get_file_contents"),
+            None
+        )
         
         agent = create_agent(
             model=get_model(thinking_level="high"),
-            tools=[*filtered_tools],
+            tools=[*filtered_tools, read_files],
             system_prompt=TARGET_PROMPT,
             response_format=ToolStrategy(TargetResponse),
+            context_schema=FileReaderContext,
             middleware=[
-                ToolRetryMiddleware(max_retries=3, backoff_factor=2.0, initial_delay=1.0),
+                retry_tool_calls,
                 handle_tool_errors
             ]
         )
         
         context = f"""Target Repository: {state["target_repo"]}
-        Exploration Goals: {state.get("target_exploration", [])}
-        End Goal: {state.get("end_goal", "")}"""
+Exploration Goals: {to_json(state.get("target_exploration", []))}
+End Goal: {state.get("end_goal", "")}"""
         
         result = await agent.ainvoke(
             {"messages": [{"role": "user", "content": context}]},
             config,
+            context=FileReaderContext(get_file_contents=get_file_contents_tool),
         )
         response: TargetResponse = result["structured_response"]
         
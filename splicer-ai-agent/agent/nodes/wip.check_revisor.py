@@ -1,20 +1,18 @@
 from langchain.agents import create_agent
 from langchain.agents.structured_output import ToolStrategy
-from langchain.agents.middleware import ToolRetryMiddleware
 from agent.state import AgentState
 from components.model import get_model
-from components.responses import CheckRevisorResponse
+from components.responses import CheckRevisorResponse, to_json
 from components.system_prompts.check_revisor_prompt import CHECK_REVISOR_PROMPT
-from components.tools import dependency, handle_tool_errors
-from components.github_mcp import github_session, get_token_from_config, CHECK_REVISOR_AGENT_TOOLS
+from components.tools import dependency, handle_tool_errors, retry_tool_calls
+from components.github_mcp import github_tools, filter_tools, CHECK_REVISOR_AGENT_TOOLS
 
 
 async def check_revisor_agent(state: AgentState, config) -> dict:
     """Fix syntax errors identified by the check node."""
-    token = get_token_from_config(config)
-    async with github_session(token) as mcp_tools:
+    async with github_tools(config) as mcp_tools:
         # Filter to check revisor agent tools + dependency tool
-        filtered_tools = [t for t in mcp_tools if t.name in CHECK_REVISOR_AGENT_TOOLS]
+        filtered_tools = filter_tools(mcp_tools, CHECK_REVISOR_AGENT_TOOLS)
         
         agent = create_agent(
             model=get_model(thinking_level="high"),
@@ -23,7 +21,7 @@ async def check_revisor_agent(state: AgentState, config) -> dict:
             response_format=ToolStrategy(CheckRevisorResponse),
             state_schema=AgentState,
             middleware=[
-                ToolRetryMiddleware(max_retries=3, backoff_factor=2.0, initial_delay=1.0),
+                retry_tool_calls,
                 handle_tool_errors
             ]
         )
@@ -32,17 +30,18 @@ async def check_revisor_agent(state: AgentState, config) -> dict:
         check_output = state.get("check_output", {})
         source_metadata = state.get("source_metadata", {})
         
+        # Run-stable sections first, errors last, so repeated passes share a prompt prefix
         context = f"""Target Repository: {state["target_repo"]}
-        Branch: {state["branch"]}
+Branch: {state["branch"]}
 
-        ## Check Output (ERRORS TO FIX)
-        {check_output}
+## Source Metadata (for dependency versions)
+{to_json(source_metadata)}
 
-        ## Source Metadata (for dependency versions)
-        {source_metadata}
+## Changeset (files that were modified by integrator)
+{to_json(state.get("changeset", []))}
 
-        ## Changeset (files that were modified by integrator)
-        {state.get("changeset", [])}"""
+## Check Output (ERRORS TO FIX)
+{to_json(check_output)}"""
         
         result = await agent.ainvoke(
             {"messages": [{"role": "user", "content": context}]},
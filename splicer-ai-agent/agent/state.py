@@ -8,6 +8,11 @@ class AgentState(TypedDict):
     source_repo: str
     target_repo: str
     branch: str
+    # Per-user scope for node cache keys (set by server.py from the verified JWT)
+    cache_scope: Optional[str]
+    
+    # Setup Node Output ("owner/repo:branch" once the branch is known to exist this run)
+    ensured_branch: Optional[str]
     
     # Messages (for chat history and streaming)
     messages: Annotated[List[AnyMessage], add_messages]
@@ -2,7 +2,8 @@
 
 import os
 import fnmatch
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Tuple
 from langchain_core.documents import Document
 from langchain_community.document_loaders import GithubFileLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter, Language
@@ -128,6 +129,15 @@ def embeddings_model() -> GoogleGenerativeAIEmbeddings:
         output_dimensionality=768
     )
 
+@lru_cache(maxsize=2048)
+def embed_query(query: str) -> Tuple[float, ...]:
+    """
+    Embed a search query, memoized per process so repeated queries skip the API call.
+    
+    - Returns: The embedding as a tuple (hashable, safe to share between callers)
+    """
+    return tuple(embeddings_model().embed_query(query))
+
 def supabase_upload(documents: List[Document]) -> None:
     """
     Upsert documents into Supabase vector store.
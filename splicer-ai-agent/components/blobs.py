@@ -0,0 +1,135 @@
+"""
+Content-addressed storage for copied file contents.
+
+copied_files is written to the checkpointer on every step after source_agent,
+and file contents dominate its size. When SPLICER_BLOB_BUCKET names a Supabase
+Storage bucket, dehydrate_files uploads each content once under
+"{hashed scope}/{digest}" and state keeps only {"path", "hash", "type"}; hydrate_files
+restores the content for the nodes that need it (paster, integrator). Without
+the variable, or without a scope, files keep their content inline.
+
+Blobs hold private repository contents, so the bucket must be private and is
+accessed with the service-role client (never the publishable key). Keys are
+prefixed with the requesting user's scope (cache_scope), and every download is
+checked against its digest, so a blob that was overwritten is rejected rather
+than pasted into a repository.
+"""
+import asyncio
+import os
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Any, Dict, List, Optional
+
+_BLOB_BUCKET = os.environ.get("SPLICER_BLOB_BUCKET")
+
+# Recently stored/fetched contents by object key, so nodes in the same process skip the download
+_CONTENT_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_CONTENT_CACHE_SIZE = 256
+
+# Set once the bucket has been confirmed private
+_bucket_checked = False
+
+
+def content_hash(content: str) -> str:
+    """Digest used as the blob's storage key."""
+    return blake2b(content.encode(), digest_size=32).hexdigest()
+
+
+def _object_key(scope: str, digest: str) -> str:
+    """Storage path for a blob: digest under a hashed scope (no raw user IDs in paths)."""
+    return f"{blake2b(scope.encode(), digest_size=16).hexdigest()}/{digest}"
+
+
+def _remember(key: str, content: str) -> None:
+    _CONTENT_CACHE[key] = content
+    _CONTENT_CACHE.move_to_end(key)
+    while len(_CONTENT_CACHE) > _CONTENT_CACHE_SIZE:
+        _CONTENT_CACHE.popitem(last=False)
+
+
+def _bucket():
+    """Storage handle for the blob bucket, refusing to use a public bucket."""
+    global _bucket_checked
+    from components.supabase.client import supabase_service_client
+
+    if not _BLOB_BUCKET:
+        raise ValueError("SPLICER_BLOB_BUCKET is not set but copied_files contain blob hashes")
+    storage = supabase_service_client().storage
+    if not _bucket_checked:
+        if storage.get_bucket(_BLOB_BUCKET).public:
+            raise ValueError(f"Blob bucket {_BLOB_BUCKET} is public; copied file contents require a private bucket")
+        _bucket_checked = True
+    return storage.from_(_BLOB_BUCKET)
+
+
+async def dehydrate_files(files: List[Dict[str, Any]], scope: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Upload each file's content (once per digest) under scope and replace it with its hash.
+    Files are returned unchanged when blob storage is off or there is no scope.
+    """
+    if not _BLOB_BUCKET or not scope:
+        return files
+
+    dehydrated = []
+    uploads: Dict[str, bytes] = {}
+    for file in files:
+        content = file.get("content")
+        if not isinstance(content, str):
+            dehydrated.append(file)
+            continue
+        digest = content_hash(content)
+        key = _object_key(scope, digest)
+        uploads.setdefault(key, content.encode())
+        _remember(key, content)
+        dehydrated.append({**{k: v for k, v in file.items() if k != "content"}, "hash": digest})
+
+    if uploads:
+        bucket = await asyncio.to_thread(_bucket)
+        # The storage client is synchronous; upsert makes re-uploading the same key harmless
+        # (downloads are verified against the digest, so an overwrite cannot change content)
+        await asyncio.gather(*(
+            asyncio.to_thread(bucket.upload, key, data, {"upsert": "true"})
+            for key, data in uploads.items()
+        ))
+    return dehydrated
+
+
+async def hydrate_files(files: List[Dict[str, Any]], scope: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Restore content for files that carry a hash instead of inline content.
+
+    Raises:
+        ValueError: If files carry hashes but there is no scope, or a downloaded
+            blob does not match its digest.
+    """
+    contents: Dict[str, str] = {}
+    missing = []
+    for file in files:
+        if "content" in file or "hash" not in file or file["hash"] in contents:
+            continue
+        if not scope:
+            raise ValueError("copied_files contain blob hashes but the run has no cache_scope")
+        digest = file["hash"]
+        cached = _CONTENT_CACHE.get(_object_key(scope, digest))
+        if cached is not None:
+            contents[digest] = cached
+        elif digest not in missing:
+            missing.append(digest)
+
+    if missing:
+        bucket = await asyncio.to_thread(_bucket)
+        blobs = await asyncio.gather(*(
+            asyncio.to_thread(bucket.download, _object_key(scope, digest)) for digest in missing
+        ))
+        for digest, data in zip(missing, blobs):
+            content = data.decode()
+            if content_hash(content) != digest:
+                raise ValueError(f"Blob {_object_key(scope, digest)} does not match its digest")
+            contents[digest] = content
+            _remember(_object_key(scope, digest), content)
+
+    return [
+        {**{k: v for k, v in file.items() if k != "hash"}, "content": contents[file["hash"]]}
+        if "content" not in file and "hash" in file else file
+        for file in files
+    ]
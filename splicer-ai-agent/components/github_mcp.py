@@ -9,23 +9,40 @@ Token is passed per-request via LangGraph runtime config:
     config["configurable"]["github_token"]
 """
 
+import asyncio
+import hashlib
+import logging
 import os
+import re
+import time
 from contextlib import asynccontextmanager
-from typing import Any, Dict, Optional, List
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, NamedTuple, Optional, List, Tuple
 import anyio
-from langchain_mcp_adapters.client import MultiServerMCPClient
-from langchain_mcp_adapters.tools import load_mcp_tools
-from langchain_core.tools import BaseTool
+import httpx
+
+# The MCP adapter stack is imported where a session is opened, so nodes that
+# only import tool sets and helpers from here stay cheap on cold start
+if TYPE_CHECKING:
+    from langchain_mcp_adapters.client import MultiServerMCPClient
+    from langchain_core.tools import BaseTool
 
 # GitHub Remote MCP Server endpoints
 GITHUB_MCP_URL = "https://api.githubcopilot.com/mcp/"
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
 # For GitHub Enterprise Cloud with data residency (ghe.com):
 # https://copilot-api.{subdomain}.ghe.com/mcp
+# GITHUB_HOST for Enterprise Cloud: https://octocorp.ghe.com -> subdomain "octocorp"
+_GHE_HOST_RE = re.compile(r"(?:https?://)?(?P<sub>[^.]*)(?:\..*)?\.ghe\.com")
 
 
 # Env var used for local dev when config does not contain github_token (e.g. LangGraph dev)
 GITHUB_TOKEN_ENV = "GITHUB_TOKEN"
 
+# config["configurable"] key holding MCP tools from a run-wide session (set by server.py)
+MCP_TOOLS_CONFIG_KEY = "mcp_tools"
+
 
 def get_token_from_config(config: Optional[Dict[str, Any]]) -> str:
     """
@@ -66,11 +83,31 @@ def get_token_from_config(config: Optional[Dict[str, Any]]) -> str:
     )
 
 
+class RepoRef(NamedTuple):
+    """A repository's owner and name, parsed from an 'owner/repo' string."""
+    owner: str
+    repo: str
+
+
+@lru_cache(maxsize=128)
+def parse_repo(full_name: str) -> RepoRef:
+    """
+    Split 'owner/repo' into a RepoRef, once per distinct string.
+    
+    Raises:
+        ValueError: If full_name is not in 'owner/repo' format.
+    """
+    if "/" not in full_name:
+        raise ValueError(f"Invalid repository format: {full_name}. Expected 'owner/repo'")
+    return RepoRef(*full_name.split("/", 1))
+
+
 def get_github_host() -> Optional[str]:
     """Get GITHUB_HOST for Enterprise. Returns None for standard github.com."""
     return os.getenv("GITHUB_HOST")
 
 
+@lru_cache(maxsize=1)
 def _get_mcp_url() -> str:
     """
     Get the GitHub Remote MCP Server URL.
@@ -79,6 +116,7 @@ def _get_mcp_url() -> str:
     For GitHub Enterprise Cloud (ghe.com): https://copilot-api.{subdomain}.ghe.com/mcp
     
     Note: GitHub Enterprise Server does not support the remote MCP server.
+    Cached: GITHUB_HOST is fixed for the life of the process.
     """
     host = get_github_host()
     
@@ -86,10 +124,9 @@ def _get_mcp_url() -> str:
         return GITHUB_MCP_URL
     
     # Handle GitHub Enterprise Cloud with data residency (*.ghe.com)
-    if host.endswith(".ghe.com"):
-        # Extract subdomain: https://octocorp.ghe.com -> octocorp
-        subdomain = host.replace("https://", "").replace("http://", "").split(".")[0]
-        return f"https://copilot-api.{subdomain}.ghe.com/mcp"
+    match = _GHE_HOST_RE.fullmatch(host)
+    if match:
+        return f"https://copilot-api.{match['sub']}.ghe.com/mcp"
     
     # GitHub Enterprise Server does not support remote MCP server
     raise ValueError(
@@ -101,12 +138,109 @@ def _get_mcp_url() -> str:
     )
 
 
-def create_github_mcp_client(token: str) -> MultiServerMCPClient:
+@lru_cache(maxsize=1)
+def get_graphql_url() -> str:
+    """
+    Get the GitHub GraphQL API URL for the configured host.
+    
+    For standard GitHub.com: https://api.github.com/graphql
+    For GitHub Enterprise Cloud (ghe.com): https://api.{subdomain}.ghe.com/graphql
+    """
+    host = get_github_host()
+    
+    if host is None:
+        return GITHUB_GRAPHQL_URL
+    
+    match = _GHE_HOST_RE.fullmatch(host)
+    if match:
+        return f"https://api.{match['sub']}.ghe.com/graphql"
+    
+    raise ValueError(f"GraphQL endpoint not supported for GitHub host: {host}")
+
+
+# Connection pool shared by every MCP session in the process (see _pooled_http_client)
+_MCP_POOL_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("MCP_MAX_CONNECTIONS", "100")),
+    max_keepalive_connections=int(os.getenv("MCP_MAX_KEEPALIVE_CONNECTIONS", "20")),
+    keepalive_expiry=float(os.getenv("MCP_KEEPALIVE_EXPIRY", "30")),
+)
+_shared_transport: Optional[httpx.AsyncHTTPTransport] = None
+
+
+class _SharedPoolTransport(httpx.AsyncBaseTransport):
+    """
+    Per-client view of the process-wide connection pool.
+    
+    The MCP HTTP transport closes its httpx client when a session ends; closing
+    this wrapper is a no-op, so pooled keep-alive connections outlive the session.
+    """
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        global _shared_transport
+        if _shared_transport is None:
+            _shared_transport = httpx.AsyncHTTPTransport(limits=_MCP_POOL_LIMITS)
+        return await _shared_transport.handle_async_request(request)
+    
+    async def aclose(self) -> None:
+        pass
+
+
+def _pooled_http_client(
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[httpx.Timeout] = None,
+    auth: Optional[httpx.Auth] = None,
+) -> httpx.AsyncClient:
+    """httpx client factory for MCP sessions: per-session headers/auth, shared connections."""
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=timeout if timeout is not None else httpx.Timeout(30.0, read=300.0),
+        auth=auth,
+        follow_redirects=True,
+        transport=_SharedPoolTransport(),
+    )
+
+
+_graphql_client: Optional[httpx.AsyncClient] = None
+
+
+async def github_graphql(token: str, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a GitHub GraphQL query and return its "data" object.
+    
+    Requests go through the same process-wide connection pool as MCP sessions,
+    so repeated queries reuse keep-alive connections.
+    
+    Raises:
+        httpx.HTTPStatusError: If GitHub responds with an error status.
+    """
+    global _graphql_client
+    if _graphql_client is None:
+        _graphql_client = httpx.AsyncClient(timeout=30.0, transport=_SharedPoolTransport())
+    response = await _graphql_client.post(
+        get_graphql_url(),
+        json={"query": query, "variables": variables},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    response.raise_for_status()
+    return response.json().get("data") or {}
+
+
+async def close_shared_transport() -> None:
+    """Close the pooled MCP and GraphQL connections (call once at process shutdown)."""
+    global _shared_transport, _graphql_client
+    _graphql_client = None
+    if _shared_transport is not None:
+        transport, _shared_transport = _shared_transport, None
+        await transport.aclose()
+
+
+def create_github_mcp_client(token: str) -> "MultiServerMCPClient":
     """
     Create GitHub MCP client using HTTP transport to GitHub's Remote MCP Server.
     
     Uses HTTP transport for serverless compatibility - no subprocess required.
-    Authentication via Bearer token in Authorization header.
+    Authentication via Bearer token in Authorization header. Connections come from
+    a process-wide pool, so new sessions reuse warm TCP/TLS connections.
     
     Args:
         token: GitHub installation access token (from runtime config)
@@ -114,6 +248,8 @@ def create_github_mcp_client(token: str) -> MultiServerMCPClient:
     Returns:
         Configured MultiServerMCPClient instance
     """
+    from langchain_mcp_adapters.client import MultiServerMCPClient
+    
     url = _get_mcp_url()
     
     client = MultiServerMCPClient(
@@ -124,6 +260,7 @@ def create_github_mcp_client(token: str) -> MultiServerMCPClient:
                 "headers": {
                     "Authorization": f"Bearer {token}",
                 },
+                "httpx_client_factory": _pooled_http_client,
             }
         }
     )
@@ -132,92 +269,398 @@ def create_github_mcp_client(token: str) -> MultiServerMCPClient:
 
 # GitHub MCP Tool Sets for Each Agent
 # Source Agent: Explore source repo and extract files
-SOURCE_AGENT_TOOLS = {
+SOURCE_AGENT_TOOLS = frozenset({
     "get_file_contents",      # Read file content
     "search_code",            # Search code patterns (also useful for finding files)
     "search_repositories",    # Repo metadata
-}
+})
 
 # Target Agent: Explore target repo and understand structure
-TARGET_AGENT_TOOLS = {
+TARGET_AGENT_TOOLS = frozenset({
     "get_file_contents",      # Read file content
     "search_code",            # Search patterns (also useful for finding files)
     "search_repositories",    # Repo metadata
-}
+})
 
 # Paster Agent: Paste files into target repo
-PASTER_AGENT_TOOLS = {
+PASTER_AGENT_TOOLS = frozenset({
     "push_files",             # Atomic file commits
-}
+})
 
 # Integrator Agent: Adapt code to target environment
-INTEGRATOR_AGENT_TOOLS = {
+INTEGRATOR_AGENT_TOOLS = frozenset({
     "get_file_contents",      # Read files (required for whole-file updates)
     "search_code",            # Search patterns (find imports, usages, files)
     "push_files",             # Create/update files atomically (no SHA needed, works for single or batch)
-}
+})
 
 # Validator Agent: Check integrated work (read-only)
-VALIDATOR_AGENT_TOOLS = {
+VALIDATOR_AGENT_TOOLS = frozenset({
     "get_file_contents",      # Read files to verify content
     "search_code",            # Search for issues/broken imports
-}
+})
 
 # Revisor Agent: Fix validation issues
-REVISOR_AGENT_TOOLS = {
+REVISOR_AGENT_TOOLS = frozenset({
     "get_file_contents",      # Read files
     "search_code",            # Find code to fix
     "push_files",             # Create/update files (atomic, no SHA needed)
-}
+})
 
 # Check Revisor Agent: Fix syntax errors caught by check node
-CHECK_REVISOR_AGENT_TOOLS = {
+CHECK_REVISOR_AGENT_TOOLS = frozenset({
     "get_file_contents",      # Read files to understand context
     "search_code",            # Search for patterns if needed
     "push_files",             # Write fixes
-}
+})
+
+# Non-agent nodes call these tools directly
+SETUP_NODE_TOOLS = frozenset({"create_branch"})
+CHECK_NODE_TOOLS = frozenset({"get_file_contents"})
+CLEAN_UP_NODE_TOOLS = frozenset({"get_file_contents", "delete_file"})
+
+# Every tool any node uses; sessions only build LangChain wrappers for these
+ALL_AGENT_TOOL_NAMES = frozenset().union(
+    SOURCE_AGENT_TOOLS,
+    TARGET_AGENT_TOOLS,
+    PASTER_AGENT_TOOLS,
+    INTEGRATOR_AGENT_TOOLS,
+    VALIDATOR_AGENT_TOOLS,
+    REVISOR_AGENT_TOOLS,
+    CHECK_REVISOR_AGENT_TOOLS,
+    SETUP_NODE_TOOLS,
+    CHECK_NODE_TOOLS,
+    CLEAN_UP_NODE_TOOLS,
+)
+
+
+def filter_tools(mcp_tools: List["BaseTool"], allowed: frozenset) -> List["BaseTool"]:
+    """Return the session tools whose names are in an agent's tool set, in session order."""
+    return [t for t in mcp_tools if t.name in allowed]
+
+
+# Warm-session pool: idle sessions per token digest, reused until they age out.
+# Installation tokens are short-lived, so sessions are retired well before expiry.
+_SESSION_MAX_AGE = float(os.getenv("MCP_SESSION_MAX_AGE", "600"))
+_MAX_IDLE_SESSIONS = int(os.getenv("MCP_MAX_IDLE_SESSIONS", "4"))
+_idle_sessions: Dict[str, List["_PooledSession"]] = {}
+
+
+# Sessions currently lent out, shared by concurrent borrowers of the same token,
+# and in-flight opens, so simultaneous first borrowers wait on one handshake
+_active_sessions: Dict[str, "_PooledSession"] = {}
+_opening_sessions: Dict[str, "asyncio.Future[None]"] = {}
+
+
+# Open sessions by id() of their tools list, so github_tools can tell whether the
+# run-wide tools in config still have a live session behind them
+_sessions_by_tools: Dict[int, "_PooledSession"] = {}
+
+
+# Errors meaning the session's underlying streams are gone
+_SESSION_CLOSED_ERRORS = (anyio.BrokenResourceError, anyio.ClosedResourceError)
+
+
+class _TrackedSession:
+    """
+    MCP session proxy handed to the tool wrappers. A tool call that finds the
+    session's streams closed marks it, so the pool stops lending the session
+    out even if the borrower catches the error.
+    """
+    
+    def __init__(self, session: Any) -> None:
+        self._session = session
+        self.closed = False
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+    
+    async def call_tool(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return await self._session.call_tool(*args, **kwargs)
+        except _SESSION_CLOSED_ERRORS:
+            self.closed = True
+            raise
+
+
+@dataclass
+class _PooledSession:
+    """An MCP session held open by its owner task until closed."""
+    tools: List["BaseTool"]
+    task: "asyncio.Task[None]"
+    closing: asyncio.Event
+    session: Optional[_TrackedSession] = None
+    created_at: float = field(default_factory=time.monotonic)
+    borrowers: int = 0
+    broken: bool = False
+    
+    def __post_init__(self) -> None:
+        _sessions_by_tools[id(self.tools)] = self
+    
+    def alive(self) -> bool:
+        """Whether the connection is still up and no borrower found it broken (age aside)."""
+        return (
+            not self.broken
+            and not (self.session is not None and self.session.closed)
+            and not self.task.done()
+        )
+    
+    def usable(self) -> bool:
+        return (
+            self.alive()
+            and self.task.get_loop() is asyncio.get_running_loop()
+            and time.monotonic() - self.created_at < _SESSION_MAX_AGE
+        )
+    
+    def close(self) -> None:
+        _sessions_by_tools.pop(id(self.tools), None)
+        self.closing.set()
+
+
+# tools/list schemas per MCP URL. The GitHub server's tool set is static, so new
+# sessions rebuild their (session-bound) tool wrappers from cached schemas.
+_TOOL_SCHEMA_TTL = float(os.getenv("MCP_TOOL_SCHEMA_TTL", "300"))
+_tool_schemas: Dict[str, Tuple[float, List[Any]]] = {}
+
+
+async def _load_tools(session: Any, url: str) -> List["BaseTool"]:
+    """
+    load_mcp_tools, but skipping the tools/list round-trip while the schema cache is
+    fresh, and only wrapping tools named in ALL_AGENT_TOOL_NAMES.
+    """
+    from langchain_mcp_adapters.tools import convert_mcp_tool_to_langchain_tool
+    
+    cached = _tool_schemas.get(url)
+    if cached is not None and time.monotonic() - cached[0] < _TOOL_SCHEMA_TTL:
+        schemas = cached[1]
+    else:
+        schemas = []
+        cursor = None
+        while True:
+            page = await session.list_tools(cursor=cursor)
+            schemas.extend(page.tools)
+            cursor = page.nextCursor
+            if not cursor:
+                break
+        _tool_schemas[url] = (time.monotonic(), schemas)
+    return [
+        convert_mcp_tool_to_langchain_tool(session, schema)
+        for schema in schemas
+        if schema.name in ALL_AGENT_TOOL_NAMES
+    ]
+
+
+async def _own_session(
+    token: str,
+    ready: "asyncio.Future[Tuple[List[BaseTool], _TrackedSession]]",
+    closing: asyncio.Event,
+) -> None:
+    """
+    Enter an MCP session, publish its tools, and hold it open until closing is set.
+    
+    The session's cancel scopes must be exited by the task that entered them, so
+    each pooled session lives in its own task rather than the borrowing request's.
+    """
+    client = create_github_mcp_client(token)
+    try:
+        async with client.session("github") as session:
+            tracked = _TrackedSession(session)
+            ready.set_result((await _load_tools(tracked, _get_mcp_url()), tracked))
+            await closing.wait()
+    except* _SESSION_CLOSED_ERRORS as eg:
+        # The HTTP transport commonly closes streams under the session during teardown
+        if not ready.done():
+            raise
+        logging.debug(f"MCP session cleanup {eg!r} (ignored)")
+    except* Exception as eg:
+        if not ready.done():
+            raise
+        logging.warning(f"MCP session cleanup error (ignored): {eg!r}")
+
+
+def _unwrap_group(exc: BaseException) -> BaseException:
+    """Reduce single-exception groups (as except* re-raises them) to the original error."""
+    while isinstance(exc, BaseExceptionGroup) and len(exc.exceptions) == 1:
+        exc = exc.exceptions[0]
+    return exc
+
+
+async def _open_pooled_session(token: str) -> _PooledSession:
+    """Start an owner task for a new session and wait for its tools."""
+    ready: "asyncio.Future[Tuple[List[BaseTool], _TrackedSession]]" = asyncio.get_running_loop().create_future()
+    closing = asyncio.Event()
+    task = asyncio.create_task(_own_session(token, ready, closing))
+    try:
+        await asyncio.wait((ready, task), return_when=asyncio.FIRST_COMPLETED)
+    except BaseException:
+        closing.set()
+        task.cancel()
+        raise
+    if not ready.done():
+        # The owner task ended before the session was usable: surface its error
+        error = task.exception()
+        raise _unwrap_group(error) if error else RuntimeError("MCP session closed during setup")
+    tools, session = ready.result()
+    return _PooledSession(tools=tools, task=task, closing=closing, session=session)
+
+
+def _take_idle_session(key: str) -> Optional[_PooledSession]:
+    """Pop a usable idle session for key, closing any that went stale."""
+    idle = _idle_sessions.get(key, [])
+    while idle:
+        pooled = idle.pop()
+        if pooled.usable():
+            return pooled
+        pooled.close()
+    return None
+
+
+def _sweep_idle_sessions() -> None:
+    """Close idle sessions that aged out or whose connection ended."""
+    for key in list(_idle_sessions):
+        idle = _idle_sessions[key]
+        keep = [pooled for pooled in idle if pooled.usable()]
+        for pooled in idle:
+            if pooled not in keep:
+                pooled.close()
+        if keep:
+            _idle_sessions[key] = keep
+        else:
+            del _idle_sessions[key]
+
+
+async def _borrow_session(key: str, token: str, fresh: bool = False) -> _PooledSession:
+    """
+    Share the token's lent-out session if there is one, otherwise take an idle one
+    or open a new one. Concurrent callers that find an open in flight wait for it
+    and then share its session instead of each doing their own handshake.
+    
+    With fresh, always open a new session that is not shared with other borrowers
+    (it can still be parked idle for reuse once released).
+    """
+    if fresh:
+        pooled = await _open_pooled_session(token)
+        pooled.borrowers = 1
+        return pooled
+    
+    while True:
+        active = _active_sessions.get(key)
+        if active is not None and active.usable():
+            active.borrowers += 1
+            return active
+        opening = _opening_sessions.get(key)
+        if opening is None:
+            break
+        # Re-check after the open settles; if it failed, one waiter retries it
+        await asyncio.wait((opening,))
+    
+    opening = asyncio.get_running_loop().create_future()
+    _opening_sessions[key] = opening
+    try:
+        pooled = _take_idle_session(key) or await _open_pooled_session(token)
+    finally:
+        del _opening_sessions[key]
+        opening.set_result(None)
+    
+    pooled.borrowers = 1
+    _active_sessions[key] = pooled
+    return pooled
+
+
+def _release_session(key: str, pooled: _PooledSession, failed: bool) -> None:
+    """Return a borrow; the last borrower parks the session idle or closes it."""
+    pooled.borrowers -= 1
+    if failed:
+        # Stop lending it out; close once current borrowers are done
+        pooled.broken = True
+    if failed or pooled.borrowers == 0:
+        if _active_sessions.get(key) is pooled:
+            del _active_sessions[key]
+    if pooled.borrowers:
+        return
+    
+    idle = _idle_sessions.setdefault(key, [])
+    if pooled.usable() and len(idle) < _MAX_IDLE_SESSIONS:
+        idle.append(pooled)
+    else:
+        pooled.close()
+
+
+async def close_idle_sessions() -> None:
+    """Close every pooled MCP session (call once at process shutdown)."""
+    sessions = [pooled for idle in _idle_sessions.values() for pooled in idle]
+    _idle_sessions.clear()
+    for pooled in sessions:
+        pooled.close()
+    await asyncio.gather(*(pooled.task for pooled in sessions), return_exceptions=True)
+
 
 @asynccontextmanager
-async def github_session(token: str):
+async def github_session(token: str, fresh: bool = False):
     """
-    Context manager that yields ALL GitHub MCP tools bound to a stateful session.
+    Context manager that yields the GitHub MCP tools used by any node (see
+    ALL_AGENT_TOOL_NAMES), bound to a stateful session.
     
-    Creates a fresh client per session with the provided token. Each agent should
-    filter to only the tools it needs from the sets defined above.
-    All tool calls within the session share a single persistent connection.
+    Sessions are pooled per token (keyed by its SHA-256 digest): concurrent
+    callers share one session (MCP requests are multiplexed over it), a warm idle
+    session is reused when one is available, and otherwise a single new one is
+    opened even if several callers arrive at once. A session goes back to the pool
+    only if every borrower completed without error and no tool call found its
+    streams closed (even if the caller caught that error), so a broken session is
+    never handed out again. Pass fresh=True to skip the shared and idle sessions
+    and open a new one, e.g. to retry after a session closed. Each agent should
+    filter to only the tools it needs from the sets defined above. All tool calls
+    within the session share a single persistent connection.
     
     Args:
         token: GitHub installation access token (use get_token_from_config(config))
+        fresh: Open a new, unshared session instead of reusing a pooled one
         
     Usage:
         token = get_token_from_config(config)
         async with github_session(token) as mcp_tools:
             # Filter to agent-specific tools
-            filtered = [t for t in mcp_tools if t.name in SOURCE_AGENT_TOOLS]
+            filtered = filter_tools(mcp_tools, SOURCE_AGENT_TOOLS)
             agent = create_agent(model, tools=[*filtered, search, copy], ...)
     """
-    import logging
-    
-    client = create_github_mcp_client(token)
-    body_completed = False
+    key = hashlib.sha256(token.encode()).hexdigest()
+    _sweep_idle_sessions()
+    pooled = await _borrow_session(key, token, fresh=fresh)
     
     try:
-        async with client.session("github") as session:
-            tools: List[BaseTool] = await load_mcp_tools(session)
-            yield tools
-            body_completed = True
-    except Exception as e:
-        # Handle cleanup errors that occur after the body completed successfully
-        # This includes ExceptionGroup from TaskGroup, BrokenResourceError, etc.
-        # These commonly occur during HTTP transport session teardown
-        if not body_completed:
-            raise
-        
-        # Log cleanup errors but don't fail the operation
-        error_name = type(e).__name__
-        if isinstance(e, ExceptionGroup):
-            logging.debug(f"MCP session cleanup ExceptionGroup (ignored): {e}")
-        elif isinstance(e, (anyio.BrokenResourceError, anyio.ClosedResourceError)):
-            logging.debug(f"MCP session cleanup {error_name} (ignored)")
-        else:
-            logging.warning(f"MCP session cleanup error (ignored): {error_name}: {e}")
+        yield pooled.tools
+    except BaseException:
+        _release_session(key, pooled, failed=True)
+        raise
+    _release_session(key, pooled, failed=False)
+
+
+@asynccontextmanager
+async def github_tools(config: Optional[Dict[str, Any]], fresh: bool = False):
+    """
+    Context manager that yields GitHub MCP tools for a graph node.
+    
+    When the caller opened one session for the whole run and injected its tools at
+    config["configurable"][MCP_TOOLS_CONFIG_KEY] (see server.py), those are reused
+    so nodes skip the MCP handshake and tools/list round-trip. If that session has
+    since closed or been marked broken, this node opens a fresh one instead of
+    failing on the dead tools. Otherwise (e.g. langgraph dev) a session is opened
+    for this node with the token from config. With fresh, the run-wide tools and
+    pooled sessions are bypassed and a new session is opened (see github_session).
+    
+    Usage:
+        async with github_tools(config) as mcp_tools:
+            filtered = filter_tools(mcp_tools, SOURCE_AGENT_TOOLS)
+    """
+    shared_tools = (config or {}).get("configurable", {}).get(MCP_TOOLS_CONFIG_KEY)
+    if shared_tools is not None and not fresh:
+        shared = _sessions_by_tools.get(id(shared_tools))
+        if shared is None or shared.alive():
+            yield shared_tools
+            return
+        # Remote MCP sessions can close mid-run; later nodes continue on a new one
+        logging.debug("Run-wide MCP session is closed; opening a fresh session")
+        fresh = True
+    
+    async with github_session(get_token_from_config(config), fresh=fresh) as mcp_tools:
+        yield mcp_tools
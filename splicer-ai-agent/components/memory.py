@@ -1,24 +1,54 @@
 """
 PostgreSQL checkpointer backed by Supabase database.
 
+All callers share one AsyncPostgresSaver backed by a process-wide connection
+pool, so graph runs don't each pay for TCP + TLS + Postgres auth.
+
 Usage:
     async with get_checkpointer() as checkpointer:
         graph = workflow.compile(checkpointer=checkpointer)
         result = await graph.ainvoke(input_data, config)
 """
+import asyncio
 import os
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
-from urllib.parse import urlparse, urlunparse, quote
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+from urllib.parse import urlparse, urlunparse, quote, parse_qsl, urlencode
+
+# The Postgres saver and driver load on first use, not at import
+if TYPE_CHECKING:
+    from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+    from psycopg import AsyncConnection
+    from psycopg_pool import AsyncConnectionPool
+
+# Pool bounds; max matches server.py's MAX_CONCURRENT_RUNS so each run can hold a connection
+_POOL_MIN_SIZE = int(os.environ.get("POSTGRES_POOL_MIN_SIZE", "2"))
+_POOL_MAX_SIZE = int(os.environ.get("POSTGRES_POOL_MAX_SIZE", "10"))
 
-from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+# Process-wide pool and saver, created on first use
+_pool: "Optional[AsyncConnectionPool]" = None
+_checkpointer: "Optional[AsyncPostgresSaver]" = None
+_checkpointer_lock = asyncio.Lock()
+
+# Connection parameters added to the URI unless it already sets them
+_DEFAULT_URI_PARAMS = {
+    "sslmode": "require",
+    "application_name": "splicer",
+    "target_session_attrs": "read-write",
+}
+
+# statement_timeout bounds a stuck checkpoint write instead of stalling the run.
+# Set per connection by the pool (see _configure_connection), not through the
+# "options" startup parameter, which Supabase's transaction-mode pooler rejects.
+_STATEMENT_TIMEOUT_MS = int(os.environ.get("POSTGRES_STATEMENT_TIMEOUT_MS", "30000"))
 
 
 def get_db_uri() -> str:
     """
     Get the Supabase PostgreSQL connection URI from environment.
     
-    Ensures sslmode=require is set for secure connections.
+    Ensures sslmode=require is set for secure connections, and tags connections
+    with application_name and a writable target.
     
     Returns:
         str: PostgreSQL connection URI with SSL enabled.
@@ -33,18 +63,77 @@ def get_db_uri() -> str:
             "Set it to your Supabase PostgreSQL connection string."
         )
     
-    # Ensure sslmode=require is set for Supabase connections
-    if "sslmode=" not in uri:
-        separator = "&" if "?" in uri else "?"
-        uri = f"{uri}{separator}sslmode=require"
+    # Fill in defaults without overriding anything the URI sets explicitly
+    parsed = urlparse(uri)
+    params = dict(parse_qsl(parsed.query))
+    for key, value in _DEFAULT_URI_PARAMS.items():
+        params.setdefault(key, value)
+    
+    return urlunparse(parsed._replace(query=urlencode(params, quote_via=quote)))
+
+
+async def _configure_connection(conn: "AsyncConnection") -> None:
+    """
+    Apply the statement timeout to each new pool connection.
     
-    return uri
+    Behind the transaction-mode pooler, a SET applies to whichever server
+    connection ran it, so the timeout is best-effort there; a session-mode or
+    direct connection keeps it for the connection's lifetime.
+    """
+    await conn.execute(f"SET statement_timeout = {_STATEMENT_TIMEOUT_MS}")
+
+
+async def get_shared_checkpointer() -> "AsyncPostgresSaver":
+    """
+    Return the process-wide AsyncPostgresSaver, opening its pool on first call.
+    
+    Connections use the same settings as AsyncPostgresSaver.from_conn_string
+    (autocommit, no prepared statements, dict rows), plus a statement timeout
+    set by _configure_connection. The saver batches each checkpoint's writes in
+    a psycopg pipeline on its own when it holds a pool.
+    """
+    global _pool, _checkpointer
+    
+    if _checkpointer is not None:
+        return _checkpointer
+    
+    async with _checkpointer_lock:
+        if _checkpointer is None:
+            from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+            from psycopg.rows import dict_row
+            from psycopg_pool import AsyncConnectionPool
+            
+            pool = AsyncConnectionPool(
+                conninfo=get_db_uri(),
+                min_size=_POOL_MIN_SIZE,
+                max_size=_POOL_MAX_SIZE,
+                kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+                configure=_configure_connection,
+                open=False,
+            )
+            await pool.open()
+            _pool = pool
+            _checkpointer = AsyncPostgresSaver(pool)
+    return _checkpointer
+
+
+async def close_checkpointer() -> None:
+    """Close the shared connection pool. Call on shutdown."""
+    global _pool, _checkpointer
+    
+    async with _checkpointer_lock:
+        pool, _pool, _checkpointer = _pool, None, None
+    if pool is not None:
+        await pool.close()
 
 
 @asynccontextmanager
-async def get_checkpointer() -> AsyncIterator[AsyncPostgresSaver]:
+async def get_checkpointer() -> AsyncIterator["AsyncPostgresSaver"]:
     """
-    Create and yield an AsyncPostgresSaver connected to Supabase.
+    Yield the shared AsyncPostgresSaver connected to Supabase.
+    
+    Exiting the context leaves the pool open for the next caller;
+    use close_checkpointer() on shutdown.
         
     Yields:
         AsyncPostgresSaver: Configured checkpointer instance.
@@ -55,9 +144,7 @@ async def get_checkpointer() -> AsyncIterator[AsyncPostgresSaver]:
             config = {"configurable": {"thread_id": "my-thread"}}
             result = await graph.ainvoke({"input": "data"}, config)
     """
-    db_uri = get_db_uri()
-    async with AsyncPostgresSaver.from_conn_string(db_uri) as checkpointer:
-        yield checkpointer
+    yield await get_shared_checkpointer()
 
 
 async def setup_checkpointer() -> None:
@@ -73,6 +160,10 @@ async def setup_checkpointer() -> None:
     
     Or use the setup script: python scripts/setup_db.py
     """
-    async with get_checkpointer() as checkpointer:
-        await checkpointer.setup()
-        print("Checkpoint tables created successfully in Supabase.")
\ No newline at end of file
+    try:
+        async with get_checkpointer() as checkpointer:
+            await checkpointer.setup()
+            print("Checkpoint tables created successfully in Supabase.")
+    finally:
+        # Scripts exit right after setup, so release the pool with their event loop
+        await close_checkpointer()
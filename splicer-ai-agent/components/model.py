@@ -1,14 +1,54 @@
+import os
+from functools import lru_cache
 from langchain.chat_models import init_chat_model
 from langchain_core.rate_limiters import InMemoryRateLimiter
 
+_REQUESTS_PER_SECOND = 2
+_CHECK_EVERY_N_SECONDS = 0.1
+_MAX_BUCKET_SIZE = 20
+
 rate_limiter = InMemoryRateLimiter(
-    requests_per_second=2,
-    check_every_n_seconds=0.1,
-    max_bucket_size=20,
+    requests_per_second=_REQUESTS_PER_SECOND,
+    check_every_n_seconds=_CHECK_EVERY_N_SECONDS,
+    max_bucket_size=_MAX_BUCKET_SIZE,
 )
 
+# With REDIS_URL set, all instances draw from one Redis bucket so the Gemini rate
+# is capped globally rather than per process (redis is an optional dependency)
+_redis_url = os.environ.get("REDIS_URL")
+if _redis_url:
+    try:
+        from components.rate_limiter import RedisTokenBucketRateLimiter
+    except ImportError:
+        pass
+    else:
+        rate_limiter = RedisTokenBucketRateLimiter(
+            _redis_url,
+            key="splicer:rate_limit:gemini",
+            requests_per_second=_REQUESTS_PER_SECOND,
+            max_bucket_size=_MAX_BUCKET_SIZE,
+            check_every_n_seconds=_CHECK_EVERY_N_SECONDS,
+            fallback=rate_limiter,
+        )
+
+# Prompt caching: Gemini caches repeated request prefixes implicitly. Agents send
+# their system prompt first and it is a module constant, so every call for the same
+# agent starts with a byte-identical prefix; keep per-run data out of system prompts.
+
 def get_model(thinking_level=None):
-    """Create a gemini-3-pro-preview model with optional thinking_level parameter."""
+    """Return a shared gemini-3-pro-preview model for the given thinking_level.
+
+    Chat models are stateless between calls, so one client per configuration
+    is reused across nodes and runs instead of being rebuilt on every call.
+    """
+    # Forward positionally so get_model("high") and get_model(thinking_level="high")
+    # share a cache entry (lru_cache keys keyword and positional calls separately)
+    return _get_model_cached(thinking_level)
+
+
+@lru_cache(maxsize=8)
+def _get_model_cached(thinking_level):
+    """Build a model; cached instances all share the module-level rate_limiter."""
     config = {}
     if thinking_level:
         config["thinking_level"] = thinking_level
@@ -0,0 +1,110 @@
+"""
+Redis token-bucket rate limiter shared by every worker process.
+
+InMemoryRateLimiter caps each process separately, so N Cloud Run instances
+together send N times the intended rate. This limiter keeps one bucket in
+Redis and refills/consumes it atomically in a Lua script, so the cap is global.
+
+redis is optional: components.model only uses this limiter when REDIS_URL is
+set and the package is installed, and falls back to InMemoryRateLimiter otherwise.
+"""
+import asyncio
+import logging
+import time
+from typing import Optional
+
+import redis
+import redis.asyncio as redis_asyncio
+from langchain_core.rate_limiters import BaseRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] = bucket key; ARGV = refill rate (tokens/s), capacity.
+# Uses the server clock so every worker agrees on elapsed time.
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return allowed
+"""
+
+
+class RedisTokenBucketRateLimiter(BaseRateLimiter):
+    """
+    Token bucket stored in Redis, shared across processes.
+
+    If Redis is unreachable, acquire falls back to the given per-process
+    limiter rather than failing the model call.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        *,
+        key: str,
+        requests_per_second: float,
+        max_bucket_size: float,
+        check_every_n_seconds: float,
+        fallback: BaseRateLimiter,
+    ) -> None:
+        self.redis_url = redis_url
+        self.key = key
+        self.requests_per_second = requests_per_second
+        self.max_bucket_size = max_bucket_size
+        self.check_every_n_seconds = check_every_n_seconds
+        self.fallback = fallback
+
+        # Clients are created on first use so the async one binds to the running loop
+        self._sync_script = None
+        self._async_script = None
+
+    def _args(self) -> list:
+        return [self.requests_per_second, self.max_bucket_size]
+
+    def _consume(self) -> bool:
+        if self._sync_script is None:
+            client = redis.Redis.from_url(self.redis_url)
+            self._sync_script = client.register_script(_TOKEN_BUCKET_LUA)
+        return bool(self._sync_script(keys=[self.key], args=self._args()))
+
+    async def _aconsume(self) -> bool:
+        if self._async_script is None:
+            client = redis_asyncio.Redis.from_url(self.redis_url)
+            self._async_script = client.register_script(_TOKEN_BUCKET_LUA)
+        return bool(await self._async_script(keys=[self.key], args=self._args()))
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        """Take a token, waiting for one if blocking."""
+        try:
+            while not self._consume():
+                if not blocking:
+                    return False
+                time.sleep(self.check_every_n_seconds)
+            return True
+        except redis.RedisError as e:
+            logger.warning(f"Redis rate limiter unavailable, using in-process limiter: {e}")
+            return self.fallback.acquire(blocking=blocking)
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        """Take a token without blocking the event loop, waiting for one if blocking."""
+        try:
+            while not await self._aconsume():
+                if not blocking:
+                    return False
+                await asyncio.sleep(self.check_every_n_seconds)
+            return True
+        except redis.RedisError as e:
+            logger.warning(f"Redis rate limiter unavailable, using in-process limiter: {e}")
+            return await self.fallback.aacquire(blocking=blocking)
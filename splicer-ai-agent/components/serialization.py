@@ -0,0 +1,42 @@
+"""
+JSON encoding and decoding shared by the server, graph nodes and tools.
+
+Backed by orjson. orjson.JSONDecodeError subclasses json.JSONDecodeError, so
+callers keep catching the stdlib exception.
+"""
+import json
+from typing import Any, Callable, Optional
+
+import orjson
+
+# Parse JSON text (str or bytes)
+json_loads = orjson.loads
+
+
+def json_dumps_bytes(
+    value: Any,
+    default: Optional[Callable[[Any], Any]] = None,
+    indent: bool = False,
+) -> bytes:
+    """
+    Encode value as UTF-8 JSON: compact, or with 2-space indentation if indent.
+
+    default converts values JSON has no representation for. Non-string dict keys
+    are stringified, as stdlib json does.
+    """
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    try:
+        return orjson.dumps(value, default=default, option=option)
+    except TypeError:
+        # orjson rejects some values stdlib json accepts (e.g. integers beyond 64 bits)
+        layout = {"indent": 2} if indent else {"separators": (",", ":")}
+        return json.dumps(value, default=default, ensure_ascii=False, **layout).encode()
+
+
+def json_dumps(
+    value: Any,
+    default: Optional[Callable[[Any], Any]] = None,
+    indent: bool = False,
+) -> str:
+    """json_dumps_bytes, decoded to str."""
+    return json_dumps_bytes(value, default=default, indent=indent).decode()
@@ -1,18 +1,58 @@
 import os
+import threading
+from typing import Optional
 from supabase import create_client, Client
 
+# Process-wide clients, created on first use
+_SUPABASE: Optional[Client] = None
+_SUPABASE_SERVICE: Optional[Client] = None
+_SUPABASE_LOCK = threading.Lock()
+
 def supabase_client() -> Client:
     """
-    Initialize and return the Supabase client.
+    Return the shared Supabase client, creating it on first call.
     
     Requires environment variables:
     - SUPABASE_URL
     - SUPABASE_PUBLISHABLE_KEY
     """
+    global _SUPABASE
+    if _SUPABASE is not None:
+        return _SUPABASE
+    
     url = os.environ.get("SUPABASE_URL")
     key = os.environ.get("SUPABASE_PUBLISHABLE_KEY")
     
     if not url or not key:
         raise ValueError("Supabase credentials (SUPABASE_URL, SUPABASE_PUBLISHABLE_KEY) not found in environment variables.")
 
-    return create_client(url, key)
+    with _SUPABASE_LOCK:
+        if _SUPABASE is None:
+            _SUPABASE = create_client(url, key)
+    return _SUPABASE
+
+def supabase_service_client() -> Client:
+    """
+    Return the shared service-role Supabase client, creating it on first call.
+    
+    For server-only data (e.g. private storage buckets); never use the
+    publishable key for these.
+    
+    Requires environment variables:
+    - SUPABASE_URL
+    - SUPABASE_SECRET_KEY
+    """
+    global _SUPABASE_SERVICE
+    if _SUPABASE_SERVICE is not None:
+        return _SUPABASE_SERVICE
+    
+    url = os.environ.get("SUPABASE_URL")
+    key = os.environ.get("SUPABASE_SECRET_KEY")
+    
+    if not url or not key:
+        raise ValueError("Supabase service credentials (SUPABASE_URL, SUPABASE_SECRET_KEY) not found in environment variables.")
+
+    with _SUPABASE_LOCK:
+        if _SUPABASE_SERVICE is None:
+            _SUPABASE_SERVICE = create_client(url, key)
+    return _SUPABASE_SERVICE
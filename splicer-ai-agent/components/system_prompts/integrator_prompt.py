@@ -8,7 +8,7 @@ You receive files that have been copied from a source repo and pasted into speci
 Complete these three tasks in order:
 
 1. **Add Dependencies**
-   Read target `package.json`, then use the `dependency` tool to add each package from `source_metadata.dependencies` with exact versions.
+   Read target `package.json`, then call the `dependencies` tool once with every package from `source_metadata.dependencies` (exact versions), and write its `updated_content` with a single `push_files`.
 
 2. **Fix Pasted Files**
    Apply `integration_instructions` (the actual modifications requested) and fix paths/imports:
@@ -67,8 +67,10 @@ This is the ONLY case where removing existing code is permitted.
 
 <tools>
 - `get_file_contents(owner, repo, path, ref)`: Read target files
+- `read_files(owner, repo, paths, ref)`: Read several known files at once (concurrent)
 - `push_files(owner, repo, branch, message, files)`: Write changes
-- `dependency(name, package_json_content, version)`: Add package
+- `dependencies(packages, package_json_content)`: Add several packages in one call
+- `dependency(name, package_json_content, version)`: Add one package
 - `search_code(query)`: Find patterns if needed
 </tools>
 
@@ -12,13 +12,14 @@ REVISOR_PROMPT = """You are the Revision Agent. Fix issues in `revision` so the
 - `get_repository_tree(owner, repo, tree_sha?)`: List directory structure.
 
 ### Custom Tools
-- `dependency(name, package_json_content, version?)`: Add npm dependency. Returns updated package.json content.
+- `dependencies(packages, package_json_content)`: Add several npm dependencies at once. Returns one updated package.json content.
   1. Read package.json with `get_file_contents`
-  2. Call `dependency(name, package_json_content, version?)`
+  2. Call `dependencies(packages=[{name, version}, ...], package_json_content)` with every package to add
   3. Write `updated_content` from result with `push_files`
+- `dependency(name, package_json_content, version?)`: Same for a single package.
 
 ### File Update Pattern
-1. Read files with `get_file_contents`
+1. Read files with `get_file_contents` - request all independent reads in the same turn, they run concurrently
 2. Modify content in memory (fix imports, add lines, etc.)
 3. Write all changes with `push_files` - batch related changes together when possible
 
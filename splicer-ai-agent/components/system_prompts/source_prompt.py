@@ -21,7 +21,7 @@ Do NOT extract:
 
 ## Extraction Strategy
 
-### Phase 1: Discovery 
+### Phase 1: Discovery
 1. `search_repositories` to confirm repo exists and get metadata
 2. `get_file_contents(owner, repo, "package.json")` - extract framework and dependency versions
 3. `search_code` with terms from `source_exploration` to locate the main feature file(s)
@@ -34,7 +34,7 @@ Do NOT extract:
 6. For imports in core files that are:
    - Local project files (paths with `./`, `../`, `@/`)
    - Custom to this feature (not generic utilities)
-   → Read and copy these direct dependencies
+   → Read these direct dependencies together in one `read_files` call, then copy each
 
 7. STOP expanding when you reach:
    - Generic UI components (shadcn/ui, design system primitives)
@@ -48,6 +48,7 @@ Do NOT extract:
 ## Tools Available
 - `search_repositories`: Find repo metadata (query)
 - `get_file_contents`: Read file or directory (owner, repo, path, ref)
+- `read_files`: Read several known files in one call, concurrently (owner, repo, paths, ref)
 - `search_code`: Search code patterns (query)
 - `get_repository_tree`: Get directory structure (owner, repo, tree_sha, path_filter, recursive)
 - `search`: Semantic search in vector store (query, limit)
@@ -24,6 +24,7 @@ Example:
 
 <tools>
 - `get_file_contents(owner, repo, path, ref)`: Read files
+- `read_files(owner, repo, paths, ref)`: Read several known files in one call (concurrent)
 - `search_code(query)`: Find patterns
 - `get_repository_tree(owner, repo, tree_sha, path_filter, recursive)`: Directory structure
 - `search_repositories(query)`: Repo metadata
@@ -33,6 +34,7 @@ Example:
 1. Start with `get_repository_tree` to understand structure.
 2. Read `package.json` for framework/dependencies.
 3. Read the file containing the insertion point to find the exact location.
+   Once the paths are known, read `package.json` and these files together with `read_files`.
 </strategy>
 
 <rules>
@@ -5,17 +5,23 @@ These tools extend the GitHub MCP tools with domain-specific functionality:
 - Temporarily removed in favor of search_code from Github MCP | search: Semantic search via Supabase vector store
 - copy: Structured file extraction with type classification for migration
 - paste: Intelligent file transfer from copied_files to target repository with name mapping
-- dependency: Add npm packages to target repository's package.json
+- dependency / dependencies: Add npm packages to target repository's package.json
+- read_files: Read several files concurrently with the GitHub MCP get_file_contents tool
 """
 
-import json
+import asyncio
+import re
 from dataclasses import dataclass
-from typing import Any, Dict, List, Literal, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Literal, Optional, Tuple
 from langchain.tools import tool, ToolRuntime
 from langchain_core.messages import ToolMessage
-from langchain.agents.middleware import wrap_tool_call
+from langchain.agents.middleware import wrap_tool_call, ToolRetryMiddleware
 from langgraph.config import get_stream_writer
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+from components.blobs import hydrate_files
+from components.github_mcp import parse_repo
+from components.serialization import json_dumps, json_loads
 
 @dataclass
 class Context:
@@ -38,8 +44,7 @@ class Context:
 #         supabase = runtime.context.get("supabase") if isinstance(runtime.context, dict) else getattr(runtime.context, "supabase", None)
 #         if supabase is None:
 #             supabase = supabase_client()
-#         embeddings = embeddings_model()
-#         query_embedding = embeddings.embed_query(query)
+#         query_embedding = list(embed_query(query))
         
 #         response = supabase.rpc(
 #             "match_documents",
@@ -82,6 +87,9 @@ async def copy(path: str, content: str, file_type: FileType) -> Dict[str, Any]:
     writer(f"Marking {path} for migration as {file_type}")
     return {"path": path, "content": content, "type": file_type}
 
+# Retry transient tool failures (shared by every agent; holds no per-run state)
+retry_tool_calls = ToolRetryMiddleware(max_retries=3, backoff_factor=2.0, initial_delay=1.0)
+
 @wrap_tool_call
 async def handle_tool_errors(request, handler):
     """Handle tool execution errors with user-friendly messages."""
@@ -100,6 +108,10 @@ class FileMapping(BaseModel):
     target_file_path: str = Field(description="Where to write the file in the target repository (e.g., 'src/components/Typewriter.tsx').")
 
 
+# Built once; dumps the validated mappings back to plain dicts for paste_tool
+_FILE_MAPPINGS = TypeAdapter(List[FileMapping])
+
+
 class PasteInput(BaseModel):
     """Input schema for paste tool - accepts multiple file mappings."""
     file_mappings: List[FileMapping] = Field(
@@ -113,7 +125,8 @@ async def paste_tool(
     copied_files: List[Dict[str, Any]],
     target_repo: str,
     push_files_tool: Any,
-    branch: str = "splice"
+    branch: str = "splice",
+    blob_scope: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """
     Core implementation of paste logic (testable without runtime injection).
@@ -125,45 +138,55 @@ async def paste_tool(
         target_repo: Target repository in 'owner/repo' format.
         push_files_tool: GitHub MCP push_files tool for atomic file commits.
         branch: Branch name to commit to (defaults to "splice").
+        blob_scope: Scope the copied files' blobs were stored under (state cache_scope).
     
     Returns:
         List of metadata dicts with target path, type, and original_source_path.
     """
     writer = get_stream_writer()
     
-    # Parse target_repo
-    if "/" not in target_repo:
-        raise ValueError(f"Invalid target_repo format: {target_repo}. Expected 'owner/repo'")
+    owner, repo = parse_repo(target_repo)
     
-    owner, repo = target_repo.split("/", 1)
+    # State may hold blob hashes instead of contents (see components.blobs)
+    copied_files = await hydrate_files(copied_files, blob_scope)
     
-    # Build files list for push_files and result metadata
-    files_to_push = []
-    results = []
+    # Build files and result metadata per target path; a repeated target keeps its last mapping
+    # (one tree entry per path). Files sharing content share the same str, not copies.
+    files_by_target: Dict[str, Dict[str, Any]] = {}
+    results_by_target: Dict[str, Dict[str, Any]] = {}
+    # Index once; reversed so a repeated path resolves to its first copy, as a linear scan would
+    copied_by_path = {f["path"]: f for f in reversed(copied_files)}
     
     for mapping in file_mappings:
         source_path = mapping["source_file_path"]
         target_path = mapping["target_file_path"]
         
-        writer(f"Pasting {source_path} → {target_path}")
-        
         # Find the source file in copied_files
-        source_file = next((f for f in copied_files if f["path"] == source_path), None)
+        source_file = copied_by_path.get(source_path)
         if not source_file:
             raise ValueError(f"File {source_path} not found in copied_files")
         
         content = source_file["content"]
         file_type = source_file["type"]
         
-        files_to_push.append({"path": target_path, "content": content})
-        results.append({
+        files_by_target[target_path] = {"path": target_path, "content": content}
+        results_by_target[target_path] = {
             "path": target_path,
             "type": file_type,
             "original_source_path": source_path
-        })
+        }
     
-    # Single atomic commit with all files
+    files_to_push = list(files_by_target.values())
+    results = list(results_by_target.values())
+    
+    # One progress event for the whole batch rather than one per file
     file_count = len(files_to_push)
+    writer(
+        f"Pasting {file_count} file{'s' if file_count != 1 else ''}:\n"
+        + "\n".join(f"{r['original_source_path']} → {r['path']}" for r in results)
+    )
+    
+    # Single atomic commit with all files
     commit_message = f"Splicer: Add {file_count} file{'s' if file_count != 1 else ''}"
     
     await push_files_tool.ainvoke({
@@ -202,6 +225,7 @@ async def paste(file_mappings: List[FileMapping], runtime: ToolRuntime[PasterCon
     copied_files = runtime.state.get("copied_files", [])
     target_repo = runtime.state.get("target_repo", "")
     branch = runtime.state.get("branch", "splice")
+    blob_scope = runtime.state.get("cache_scope")
     
     # Access MCP tool via runtime.context
     push_files_tool = runtime.context.push_files
@@ -209,17 +233,101 @@ async def paste(file_mappings: List[FileMapping], runtime: ToolRuntime[PasterCon
         raise ValueError("push_files tool not available in context")
     
     # Convert FileMapping objects to dicts
-    mappings_as_dicts = [
-        {"source_file_path": m.source_file_path, "target_file_path": m.target_file_path}
-        for m in file_mappings
-    ]
+    mappings_as_dicts = _FILE_MAPPINGS.dump_python(file_mappings)
     
     return await paste_tool(
         file_mappings=mappings_as_dicts,
         copied_files=copied_files,
         target_repo=target_repo,
         push_files_tool=push_files_tool,
-        branch=branch
+        branch=branch,
+        blob_scope=blob_scope,
+    )
+
+
+# Read files
+# Reads in flight per read_files call, to stay within GitHub's secondary rate limits
+_READ_FILES_CONCURRENCY = 8
+
+
+class ReadFilesInput(BaseModel):
+    """Input schema for read_files tool."""
+    owner: str = Field(description="Repository owner.")
+    repo: str = Field(description="Repository name.")
+    paths: List[str] = Field(description="File paths to read (e.g., ['src/App.tsx', 'package.json']).")
+    ref: Optional[str] = Field(default=None, description="Branch or ref to read from (e.g., 'splice'). Defaults to the repository's default branch.")
+
+
+@dataclass
+class FileReaderContext:
+    """Context schema for the read_files tool - holds MCP tool dependency."""
+    get_file_contents: Any
+
+
+async def read_files_tool(
+    owner: str,
+    repo: str,
+    paths: List[str],
+    get_file_contents_tool: Any,
+    ref: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Core implementation of read_files (testable without runtime injection).
+    Issues one get_file_contents call per path concurrently over the shared session,
+    at most _READ_FILES_CONCURRENCY at a time.
+    
+    Returns:
+        List of {"path", "content"} dicts in path order, or {"path", "error"} for reads that failed.
+    """
+    writer = get_stream_writer()
+    
+    paths = list(dict.fromkeys(paths))
+    writer(f"Reading {len(paths)} file{'s' if len(paths) != 1 else ''} from {owner}/{repo}")
+    
+    base_args = {"owner": owner, "repo": repo}
+    if ref:
+        base_args["ref"] = ref
+    
+    semaphore = asyncio.Semaphore(_READ_FILES_CONCURRENCY)
+    
+    async def read(path: str) -> Any:
+        async with semaphore:
+            return await get_file_contents_tool.ainvoke({**base_args, "path": path})
+    
+    # One failed read shouldn't discard the others
+    results = await asyncio.gather(*(read(path) for path in paths), return_exceptions=True)
+    
+    return [
+        {"path": path, "error": str(result)} if isinstance(result, Exception)
+        else {"path": path, "content": result}
+        for path, result in zip(paths, results)
+    ]
+
+
+@tool(args_schema=ReadFilesInput)
+async def read_files(
+    owner: str,
+    repo: str,
+    paths: List[str],
+    runtime: ToolRuntime[FileReaderContext],
+    ref: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Read several files in one call; all reads run concurrently.
+    
+    Prefer this over repeated get_file_contents calls when the paths are already
+    known (e.g., target_path, changeset, files named in the instructions).
+    """
+    get_file_contents_tool = runtime.context.get_file_contents
+    if not get_file_contents_tool:
+        raise ValueError("get_file_contents tool not available in context")
+    
+    return await read_files_tool(
+        owner=owner,
+        repo=repo,
+        paths=paths,
+        get_file_contents_tool=get_file_contents_tool,
+        ref=ref
     )
 
 
@@ -231,12 +339,96 @@ class DependencyInput(BaseModel):
     package_json_content: str = Field(description="Current package.json content (use get_file_contents first).")
 
 
+_JSON_STRING = re.compile(r'"(?:\\.|[^"\\])*"')
+_DEPENDENCIES_KEY = re.compile(r'"dependencies"\s*:\s*\{')
+
+
+@lru_cache(maxsize=256)
+def _dependency_entry_re(name: str) -> "re.Pattern[str]":
+    """Pattern for a `"name": "version"` entry."""
+    return re.compile(rf'"{re.escape(name)}"\s*:\s*"([^"]+)"')
+
+
+def _existing_dependency_version(package_json_content: str, name: str) -> Optional[str]:
+    """
+    Version of name in the top-level "dependencies" object, found without parsing.
+    
+    Only the first "dependencies" object is considered, and only when it sits
+    directly in the root object; one nested deeper (e.g. under "overrides" or a
+    workspace entry) returns None. The scan covers that object's flat string
+    entries, so devDependencies/peerDependencies never match. Returns None when
+    unsure; the caller then parses the JSON.
+    """
+    key = _DEPENDENCIES_KEY.search(package_json_content)
+    if key is None:
+        return None
+    # Nesting depth at the key, ignoring braces inside string literals
+    prefix = _JSON_STRING.sub("", package_json_content[:key.start()])
+    if '"' in prefix or prefix.count("{") - prefix.count("}") != 1:
+        return None
+    end = package_json_content.find("}", key.end())
+    if end == -1 or "{" in package_json_content[key.end():end]:
+        return None
+    match = _dependency_entry_re(name).search(package_json_content, key.end(), end)
+    return match.group(1) if match else None
+
+
+def _add_dependencies(package_json_content: str, packages: List[Tuple[str, str]]) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Core implementation shared by dependency and dependencies (testable without runtime).
+    Parses package.json at most once and serializes it once, whatever the number of packages.
+    
+    Returns:
+        The updated package.json content and a {name, version, status} dict per package.
+    """
+    writer = get_stream_writer()
+    
+    for name, version in packages:
+        # Warn if "latest" is used - this often causes compatibility issues
+        if version == "latest":
+            writer(f"WARNING: Using 'latest' for {name} - this may cause compatibility issues. Prefer using the exact version from source_metadata.dependencies.")
+    
+    writer(f"Processing dependencies: {', '.join(f'{name}@{version}' for name, version in packages)}")
+    
+    # Retries usually find the packages already present; skip the parse in that case
+    existing = {name: _existing_dependency_version(package_json_content, name) for name, _ in packages}
+    
+    package_json = None
+    if any(version is None for version in existing.values()):
+        package_json = json_loads(package_json_content)
+        
+        if "dependencies" not in package_json:
+            package_json["dependencies"] = {}
+        
+        existing = {name: package_json["dependencies"].get(name) for name, _ in packages}
+    
+    results = []
+    for name, version in packages:
+        existing_version = existing[name]
+        # Skip if already exists
+        if existing_version is not None:
+            writer(f"Skipping {name} - already exists with version {existing_version}")
+            results.append({"name": name, "version": existing_version, "status": "skipped"})
+            continue
+        
+        # Add dependency
+        package_json["dependencies"][name] = version
+        existing[name] = version
+        writer(f"Added {name}@{version}")
+        results.append({"name": name, "version": version, "status": "added"})
+    
+    if not any(result["status"] == "added" for result in results):
+        return package_json_content, results
+    return json_dumps(package_json, indent=True), results
+
+
 @tool(args_schema=DependencyInput)
 def dependency(name: str, package_json_content: str, version: str) -> Dict[str, Any]:
     """
     Add npm dependency to package.json content. Returns updated content for writing via push_files.
     
     If dependency already exists, returns status 'skipped' with existing version.
+    To add several packages, use dependencies instead.
     
     IMPORTANT: Always provide the exact version from source_metadata.dependencies.
     Using "latest" can cause compatibility issues with tested source code.
@@ -246,39 +438,39 @@ def dependency(name: str, package_json_content: str, version: str) -> Dict[str,
     2. Call dependency(name, package_json_content, version?)
     3. Write updated_content back with push_files
     """
-    writer = get_stream_writer()
-    
-    # Warn if "latest" is used - this often causes compatibility issues
-    if version == "latest":
-        writer(f"WARNING: Using 'latest' for {name} - this may cause compatibility issues. Prefer using the exact version from source_metadata.dependencies.")
-    
-    writer(f"Processing dependency: {name}@{version}")
-    
-    package_json = json.loads(package_json_content)
-    
-    if "dependencies" not in package_json:
-        package_json["dependencies"] = {}
-    
-    # Skip if already exists
-    if name in package_json["dependencies"]:
-        existing_version = package_json["dependencies"][name]
-        writer(f"Skipping {name} - already exists with version {existing_version}")
-        return {
-            "name": name,
-            "version": existing_version,
-            "status": "skipped",
-            "updated_content": package_json_content
-        }
+    updated_content, (result,) = _add_dependencies(package_json_content, [(name, version)])
+    return {**result, "updated_content": updated_content}
+
+
+class PackageSpec(BaseModel):
+    """An npm package and the version to add."""
+    name: str = Field(description="npm package name (e.g., 'framer-motion', '@types/react').")
+    version: str = Field(description="Semver version from source_metadata.dependencies (e.g., '^8.18.0'). REQUIRED - always use the exact version from the source repository.")
+
+
+class DependenciesInput(BaseModel):
+    """Input schema for dependencies tool."""
+    packages: List[PackageSpec] = Field(description="Every package to add, each with its exact version.")
+    package_json_content: str = Field(description="Current package.json content (use get_file_contents first).")
+
+
+@tool(args_schema=DependenciesInput)
+def dependencies(packages: List[PackageSpec], package_json_content: str) -> Dict[str, Any]:
+    """
+    Add several npm dependencies to package.json content in one call.
+    Returns one updated_content containing every added package, for a single push_files write.
     
-    # Add dependency
-    package_json["dependencies"][name] = version
-    updated_content = json.dumps(package_json, indent=2)
+    Packages that already exist are reported with status 'skipped' and their existing version.
     
-    writer(f"Added {name}@{version}")
+    IMPORTANT: Always provide the exact versions from source_metadata.dependencies.
     
-    return {
-        "name": name,
-        "version": version,
-        "status": "added",
-        "updated_content": updated_content
-    }
\ No newline at end of file
+    Usage:
+    1. Read package.json with get_file_contents
+    2. Call dependencies(packages=[{name, version}, ...], package_json_content)
+    3. Write updated_content back with push_files
+    """
+    updated_content, results = _add_dependencies(
+        package_json_content,
+        [(p.name, p.version) for p in packages]
+    )
+    return {"packages": results, "updated_content": updated_content}
\ No newline at end of file
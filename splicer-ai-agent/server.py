@@ -15,12 +15,14 @@ Security:
     - CORS configured for specific frontend origins only
 """
 import asyncio
-import json
+import hashlib
 import logging
 import os
+import time
 import uuid
 from contextlib import asynccontextmanager
-from typing import Any, AsyncIterator
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable
 
 import jwt
 from fastapi import FastAPI, HTTPException, Request
@@ -29,7 +31,13 @@ from fastapi.responses import StreamingResponse, JSONResponse
 from pydantic import BaseModel, Field
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 
-from agent.graph import compile_graph
+from agent.graph import compile_graph, preload_node_dependencies
+from agent.nodes.check import close_python_check_pool
+from components.memory import get_shared_checkpointer, close_checkpointer
+from components.github_mcp import (
+    github_session, close_idle_sessions, close_shared_transport, MCP_TOOLS_CONFIG_KEY,
+)
+from components.serialization import json_dumps_bytes
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -52,6 +60,14 @@ ALLOWED_ORIGINS = [
 ]
 
 
+# Recently verified stream tokens: sha256(token) -> (cache expiry, payload).
+# Entries live at most a few seconds and never past the token's own exp;
+# only successful verifications are cached, so bad tokens always re-validate.
+_VERIFIED_TOKEN_TTL = 5.0
+_VERIFIED_TOKEN_CACHE_SIZE = 10_000
+_verified_tokens: dict[bytes, tuple[float, dict[str, Any]]] = {}
+
+
 def get_jwt_secret() -> str | None:
     """Get the JWT secret for stream token verification."""
     return os.environ.get(JWT_SECRET_ENV)
@@ -100,6 +116,15 @@ def verify_stream_token(authorization: str | None) -> dict[str, Any]:
     
     token = parts[1]
     
+    # Keyed by digest so token plaintext is never held as a cache key
+    cache_key = hashlib.sha256(token.encode()).digest()
+    cached = _verified_tokens.get(cache_key)
+    if cached is not None:
+        expires_at, payload = cached
+        if time.time() < expires_at:
+            return payload
+        _verified_tokens.pop(cache_key, None)
+    
     # Get secret
     secret = get_jwt_secret()
     if not secret:
@@ -127,6 +152,12 @@ def verify_stream_token(authorization: str | None) -> dict[str, Any]:
                 detail={"error": "Token missing required github_token claim"}
             )
         
+        now = time.time()
+        if len(_verified_tokens) >= _VERIFIED_TOKEN_CACHE_SIZE:
+            # Drop the oldest entry (dicts keep insertion order)
+            _verified_tokens.pop(next(iter(_verified_tokens)), None)
+        _verified_tokens[cache_key] = (min(payload["exp"], now + _VERIFIED_TOKEN_TTL), payload)
+        
         return payload
         
     except jwt.ExpiredSignatureError:
@@ -154,12 +185,44 @@ def verify_stream_token(authorization: str | None) -> dict[str, Any]:
 
 # ============ Global State ============
 
-# Active runs that can be cancelled
-_active_runs: dict[str, asyncio.Event] = {}
-
-# Limit concurrent runs per instance to prevent resource exhaustion
-MAX_CONCURRENT_RUNS = 10
-_run_semaphore = asyncio.Semaphore(MAX_CONCURRENT_RUNS)
+@dataclass
+class _RunHandle:
+    """A cancellable run: the task streaming it, and whether that task is in the graph."""
+    task: asyncio.Task | None = None  # None until the response starts streaming
+    # True while stream_run awaits the graph (or its MCP session), where a
+    # CancelledError lands inside stream_run. Otherwise the task is sending an
+    # event, and a cancel there would cut the stream before its terminal events.
+    in_graph: bool = False
+    cancel_requested: bool = False
+
+
+# Active runs that can be cancelled: run_id -> its handle
+_active_runs: dict[str, _RunHandle] = {}
+
+# Limit concurrent runs per instance to prevent resource exhaustion.
+# Over capacity is rejected with 429, never queued, so a plain counter suffices:
+# runs_stream checks and claims a slot with no await in between (single event loop).
+MAX_CONCURRENT_RUNS = int(os.environ.get("MAX_CONCURRENT_RUNS", "10"))
+_active_run_count = 0
+
+
+def try_claim_run_slot() -> bool:
+    """Claim a run slot if one is free. Pair with release_run_slot()."""
+    global _active_run_count
+    if _active_run_count >= MAX_CONCURRENT_RUNS:
+        return False
+    _active_run_count += 1
+    return True
+
+
+def release_run_slot() -> None:
+    """Give back a slot claimed by try_claim_run_slot()."""
+    global _active_run_count
+    if _active_run_count <= 0:
+        # A double release; keep the counter at zero rather than letting it go negative
+        logger.error("release_run_slot() called without a claimed slot")
+        return
+    _active_run_count -= 1
 
 # Checkpointer instance (initialized in lifespan)
 _checkpointer: AsyncPostgresSaver | None = None
@@ -179,9 +242,8 @@ async def lifespan(app: FastAPI):
     
     if db_uri:
         logger.info("Initializing Postgres checkpointer...")
-        # Create checkpointer context manager and enter it
-        _checkpointer_ctx = AsyncPostgresSaver.from_conn_string(db_uri)
-        _checkpointer = await _checkpointer_ctx.__aenter__()
+        # Pool-backed saver, so concurrent runs don't queue on one connection
+        _checkpointer = await get_shared_checkpointer()
         logger.info("Postgres checkpointer initialized successfully")
     else:
         logger.warning("POSTGRES_URI_CUSTOM not set - running without persistence")
@@ -191,13 +253,20 @@ async def lifespan(app: FastAPI):
     _graph = compile_graph(checkpointer=_checkpointer)
     logger.info("Graph compiled successfully")
     
+    # Import the agent stack up front so the first run doesn't pay for it
+    preload_node_dependencies()
+    
     yield
     
     # Cleanup
     if _checkpointer:
         logger.info("Closing Postgres checkpointer...")
-        await _checkpointer_ctx.__aexit__(None, None, None)
+        await close_checkpointer()
         logger.info("Postgres checkpointer closed")
+    
+    await close_idle_sessions()
+    await close_shared_transport()
+    await close_python_check_pool()
 
 
 # ============ FastAPI App ============
@@ -232,37 +301,54 @@ class RunStreamRequest(BaseModel):
 
 # ============ SSE Formatting ============
 
-def format_sse_event(event_type: str, data: Any) -> str:
-    """Format data as an SSE event."""
-    json_data = json.dumps(data, default=str)
-    return f"event: {event_type}\ndata: {json_data}\n\n"
+def format_sse_event(event_type: str, data: Any) -> bytes:
+    """Format data as an SSE event (bytes, so StreamingResponse sends it without re-encoding)."""
+    return b"event: " + event_type.encode() + b"\ndata: " + json_dumps_bytes(data, default=str) + b"\n\n"
+
+
+# Fixed-shape events sent on every run, encoded once at import
+_SSE_METADATA_PREFIX = b"event: metadata\ndata: "
+_SSE_END = format_sse_event("end", {})
+_SSE_RUN_CANCELLED = format_sse_event("error", {"error": "Run cancelled"})
+_SSE_PROCESSING_ERROR = format_sse_event("error", {"error": "Error occurred during processing"})
+
+
+def _public_attrs(chunk: Any) -> dict:
+    return {k: v for k, v in chunk.__dict__.items() if not k.startswith("_")}
+
+
+def _content_only(chunk: Any) -> dict:
+    return {"content": str(chunk)}
+
+
+# Serializer per chunk type, resolved on first sight; the messages stream calls
+# serialize_message_chunk once per token, so the attribute probes run once per class
+_serializer_cache: dict[type, Callable[[Any], dict]] = {}
 
 
 def serialize_message_chunk(chunk: Any) -> dict:
     """Serialize a message chunk for SSE streaming."""
-    if hasattr(chunk, "model_dump"):
-        return chunk.model_dump()
-    if hasattr(chunk, "dict"):
-        return chunk.dict()
-    if hasattr(chunk, "__dict__"):
-        return {k: v for k, v in chunk.__dict__.items() if not k.startswith("_")}
-    return {"content": str(chunk)}
+    serializer = _serializer_cache.get(type(chunk))
+    if serializer is None:
+        if hasattr(chunk, "model_dump"):
+            serializer = type(chunk).model_dump
+        elif hasattr(chunk, "dict"):
+            serializer = type(chunk).dict
+        elif hasattr(chunk, "__dict__"):
+            serializer = _public_attrs
+        else:
+            serializer = _content_only
+        _serializer_cache[type(chunk)] = serializer
+    return serializer(chunk)
 
 
 def serialize_state_update(node_name: str, state_delta: Any) -> dict:
     """Serialize a state update for SSE streaming."""
     if isinstance(state_delta, dict):
-        # Filter out non-serializable items and messages (too verbose)
-        serializable = {}
-        for k, v in state_delta.items():
-            if k == "messages":
-                # Just include message count, not full content
-                continue
-            try:
-                json.dumps(v, default=str)
-                serializable[k] = v
-            except (TypeError, ValueError):
-                serializable[k] = str(v)
+        # Drop messages (too verbose). Values are passed through as-is: format_sse_event
+        # encodes with default=str, so non-JSON values are stringified in that single pass
+        # instead of being test-serialized here first
+        serializable = {k: v for k, v in state_delta.items() if k != "messages"}
         return {node_name: serializable}
     return {node_name: str(state_delta)}
 
@@ -274,8 +360,7 @@ async def stream_run(
     config: dict[str, Any],
     stream_modes: list[str],
     run_id: str,
-    cancel_event: asyncio.Event,
-) -> AsyncIterator[str]:
+) -> AsyncIterator[bytes]:
     """
     Stream the graph execution as SSE events.
     
@@ -285,21 +370,36 @@ async def stream_run(
     - messages: LLM token chunks (if streaming messages)
     - error: Error events
     - end: Stream completion
+    
+    Cancellation sets cancel_requested on the run's handle. While the graph is
+    running, the task is also cancelled, so CancelledError is raised inside
+    whatever node is awaiting (e.g. an LLM call). While an event is being sent, the
+    request is noticed once the send completes. Either way the cancelled and end
+    events are emitted.
     """
     global _graph
     
+    handle = _active_runs.get(run_id)
+    if handle is None:
+        # Cancelled before the response started streaming
+        release_run_slot()
+        yield _SSE_RUN_CANCELLED
+        yield _SSE_END
+        return
+    handle.task = asyncio.current_task()
+    
     if _graph is None:
         yield format_sse_event("error", {"error": "Graph not initialized"})
         return
     
     # Emit metadata event
     thread_id = config.get("configurable", {}).get("thread_id", str(uuid.uuid4()))
-    yield format_sse_event("metadata", {
-        "run_id": run_id,
-        "thread_id": thread_id,
-    })
+    yield _SSE_METADATA_PREFIX + json_dumps_bytes({"run_id": run_id, "thread_id": thread_id}) + b"\n\n"
     
     try:
+        if handle.cancel_requested:
+            raise asyncio.CancelledError
+        
         # Determine stream mode for LangGraph
         # Frontend requests ["messages", "updates"]
         lg_stream_modes = []
@@ -310,69 +410,88 @@ async def stream_run(
         if not lg_stream_modes:
             lg_stream_modes = ["updates"]
         
-        # Stream the graph
-        async for chunk in _graph.astream(
-            input_data,
-            config=config,
-            stream_mode=lg_stream_modes,
-        ):
-            # Check for cancellation
-            if cancel_event.is_set():
-                yield format_sse_event("error", {"error": "Run cancelled"})
-                return
-            
-            # Handle different chunk formats based on stream mode
-            if isinstance(chunk, tuple) and len(chunk) == 2:
-                # Multiple stream modes: (mode, data)
-                mode, data = chunk
-                
-                if mode == "updates":
-                    # Updates are {node_name: state_delta}
-                    if isinstance(data, dict):
-                        for node_name, state_delta in data.items():
-                            serialized = serialize_state_update(node_name, state_delta)
-                            yield format_sse_event("updates", serialized)
-                
-                elif mode == "messages":
-                    # Messages are (message_chunk, metadata)
-                    if isinstance(data, tuple) and len(data) == 2:
-                        msg_chunk, metadata = data
-                        serialized_chunk = serialize_message_chunk(msg_chunk)
-                        serialized_meta = metadata if isinstance(metadata, dict) else {}
-                        yield format_sse_event("messages", [serialized_chunk, serialized_meta])
-                    else:
-                        yield format_sse_event("messages", [serialize_message_chunk(data), {}])
-            
-            elif isinstance(chunk, dict):
-                # Single stream mode (updates): {node_name: state_delta}
-                for node_name, state_delta in chunk.items():
-                    serialized = serialize_state_update(node_name, state_delta)
-                    yield format_sse_event("updates", serialized)
+        # One GitHub MCP session for the whole run; nodes reuse its tools via
+        # config["configurable"][MCP_TOOLS_CONFIG_KEY] instead of each opening their own
+        handle.in_graph = True
+        async with github_session(config["configurable"]["github_token"]) as mcp_tools:
+            config["configurable"][MCP_TOOLS_CONFIG_KEY] = mcp_tools
             
-            else:
-                # Unknown format - log and skip
-                logger.warning(f"Unknown chunk format: {type(chunk)}")
+            # Stream the graph
+            async for chunk in _graph.astream(
+                input_data,
+                config=config,
+                stream_mode=lg_stream_modes,
+            ):
+                handle.in_graph = False
+                for event in _chunk_events(chunk):
+                    yield event
+                if handle.cancel_requested:
+                    raise asyncio.CancelledError
+                handle.in_graph = True
+        handle.in_graph = False
         
         # Emit end event
-        yield format_sse_event("end", {})
+        yield _SSE_END
         
     except asyncio.CancelledError:
-        yield format_sse_event("error", {"error": "Run cancelled"})
-        yield format_sse_event("end", {})  # Always send end event
+        handle.in_graph = False
+        if not handle.cancel_requested:
+            # Not a run cancel (e.g. server shutdown): let it propagate
+            raise
+        yield _SSE_RUN_CANCELLED
+        yield _SSE_END  # Always send end event
     except BaseException as e:
+        handle.in_graph = False
         # Catch BaseException to handle ExceptionGroups from TaskGroups
         logger.exception("Error during graph execution")
         error_msg = str(e)
         # For ExceptionGroups, extract the first exception message
         if hasattr(e, 'exceptions') and e.exceptions:
             error_msg = str(e.exceptions[0])
-        yield format_sse_event("error", {"error": "Error occurred during processing"})
-        yield format_sse_event("end", {})  # Always send end event after error
+        yield _SSE_PROCESSING_ERROR
+        yield _SSE_END  # Always send end event after error
     finally:
         # Clean up active run and release concurrency slot
-        if run_id in _active_runs:
+        if _active_runs.get(run_id) is handle:
             del _active_runs[run_id]
-        _run_semaphore.release()
+        release_run_slot()
+
+
+def _chunk_events(chunk: Any) -> list[bytes]:
+    """SSE events for one chunk from _graph.astream."""
+    events = []
+    # Handle different chunk formats based on stream mode
+    if isinstance(chunk, tuple) and len(chunk) == 2:
+        # Multiple stream modes: (mode, data)
+        mode, data = chunk
+        
+        if mode == "updates":
+            # Updates are {node_name: state_delta}
+            if isinstance(data, dict):
+                for node_name, state_delta in data.items():
+                    serialized = serialize_state_update(node_name, state_delta)
+                    events.append(format_sse_event("updates", serialized))
+        
+        elif mode == "messages":
+            # Messages are (message_chunk, metadata)
+            if isinstance(data, tuple) and len(data) == 2:
+                msg_chunk, metadata = data
+                serialized_chunk = serialize_message_chunk(msg_chunk)
+                serialized_meta = metadata if isinstance(metadata, dict) else {}
+                events.append(format_sse_event("messages", [serialized_chunk, serialized_meta]))
+            else:
+                events.append(format_sse_event("messages", [serialize_message_chunk(data), {}]))
+    
+    elif isinstance(chunk, dict):
+        # Single stream mode (updates): {node_name: state_delta}
+        for node_name, state_delta in chunk.items():
+            serialized = serialize_state_update(node_name, state_delta)
+            events.append(format_sse_event("updates", serialized))
+    
+    else:
+        # Unknown format - log and skip
+        logger.warning(f"Unknown chunk format: {type(chunk)}")
+    return events
 
 
 # ============ API Endpoints ============
@@ -398,8 +517,9 @@ async def runs_stream(request: Request, body: RunStreamRequest):
     and verified here using the shared CLOUD_RUN_STREAM_SECRET.
     """
     # ============ Concurrency Check ============
-    # Reject if too many runs are already active on this instance
-    if _run_semaphore.locked():
+    # Reject early if too many runs are already active on this instance
+    # (the slot itself is claimed once the request is fully validated)
+    if _active_run_count >= MAX_CONCURRENT_RUNS:
         raise HTTPException(
             status_code=429,
             detail={"error": "Server is at capacity. Please try again shortly."}
@@ -440,21 +560,30 @@ async def runs_stream(request: Request, body: RunStreamRequest):
     # Also inject user_id for audit/ownership tracking
     config["configurable"]["user_id"] = user_id
     
+    # Scope node cache entries (e.g. repo exploration) to this user
+    if isinstance(input_data, dict):
+        input_data["cache_scope"] = user_id
+        # Branch checks are remembered for one run only; a checkpointed thread re-checks
+        input_data["ensured_branch"] = None
+    
+    # Claim a concurrency slot (released in stream_run's finally block)
+    if not try_claim_run_slot():
+        raise HTTPException(
+            status_code=429,
+            detail={"error": "Server is at capacity. Please try again shortly."}
+        )
+    
     # Generate run ID
     run_id = str(uuid.uuid4())
     
-    # Create cancellation event
-    cancel_event = asyncio.Event()
-    _active_runs[run_id] = cancel_event
+    # Register for cancellation (stream_run records its task once streaming starts)
+    _active_runs[run_id] = _RunHandle()
     
     thread_id = config["configurable"]["thread_id"]
     logger.info(f"Starting run {run_id} for thread {thread_id} (user: {user_id})")
     
-    # Acquire semaphore slot (released in stream_run's finally block)
-    await _run_semaphore.acquire()
-    
     return StreamingResponse(
-        stream_run(input_data, config, stream_modes, run_id, cancel_event),
+        stream_run(input_data, config, stream_modes, run_id),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -474,9 +603,15 @@ async def cancel_run(thread_id: str, run_id: str, action: str = "interrupt"):
         run_id: The run ID to cancel
         action: Cancel action type (default: "interrupt")
     """
-    if run_id in _active_runs:
+    # Popping the handle means a repeated cancel finds nothing, so a task is cancelled at most once
+    handle = _active_runs.pop(run_id, None)
+    if handle is not None:
         logger.info(f"Cancelling run {run_id}")
-        _active_runs[run_id].set()
+        handle.cancel_requested = True
+        # Only interrupt the graph; a task sending an event sees the flag once the
+        # send completes, so the cancelled and end events are never cut off
+        if handle.task is not None and handle.in_graph:
+            handle.task.cancel()
         return JSONResponse({"status": "cancelled"})
     
     # Run not found - might have already completed
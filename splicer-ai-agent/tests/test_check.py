@@ -0,0 +1,334 @@
+"""Tests for the check node's syntax checks."""
+
+import re
+
+import pytest
+
+import agent.nodes.check as check
+from agent.nodes.check import (
+    _brackets_balanced,
+    _check_bracket_balance,
+    _check_jsx_syntax,
+    _check_trailing_syntax,
+    _line_numbers,
+    _strip_strings_and_comments,
+    _validate_syntax,
+)
+
+
+def _reference_strip(content: str) -> str:
+    """The character scanner _strip_strings_and_comments replaced, kept as an oracle."""
+    result = []
+    i = 0
+    n = len(content)
+    while i < n:
+        if content[i:i+2] == '//':
+            result.append('//')
+            i += 2
+            while i < n and content[i] != '\n':
+                result.append(' ')
+                i += 1
+        elif content[i:i+2] == '/*':
+            result.append('/*')
+            i += 2
+            while i < n - 1 and content[i:i+2] != '*/':
+                result.append(' ' if content[i] != '\n' else '\n')
+                i += 1
+            if i < n - 1:
+                result.append('*/')
+                i += 2
+        elif content[i] == '`':
+            result.append(' ')
+            i += 1
+            while i < n and content[i] != '`':
+                if content[i] == '\\' and i + 1 < n:
+                    result.append('  ')
+                    i += 2
+                elif content[i] == '\n':
+                    result.append('\n')
+                    i += 1
+                else:
+                    result.append(' ')
+                    i += 1
+            if i < n:
+                result.append(' ')
+                i += 1
+        elif content[i] in '"\'':
+            quote = content[i]
+            result.append(' ')
+            i += 1
+            while i < n and content[i] != quote:
+                if content[i] == '\\' and i + 1 < n:
+                    result.append('  ')
+                    i += 2
+                elif content[i] == '\n':
+                    break
+                else:
+                    result.append(' ')
+                    i += 1
+            if i < n and content[i] == quote:
+                result.append(' ')
+                i += 1
+        else:
+            result.append(content[i])
+            i += 1
+    return ''.join(result)
+
+
+def _reference_bracket_errors(content: str) -> list:
+    """The original line/col bracket walk, without the balanced fast path."""
+    errors = []
+    stack = []
+    pairs = {'(': ')', '[': ']', '{': '}'}
+    closers = {')': '(', ']': '[', '}': '{'}
+    line = 1
+    col = 1
+    for char in _reference_strip(content):
+        if char in pairs:
+            stack.append((char, line, col))
+        elif char in closers:
+            if not stack:
+                errors.append(f"Unexpected '{char}' at line {line}, col {col}")
+            elif stack[-1][0] != closers[char]:
+                opener, open_line, open_col = stack[-1]
+                errors.append(
+                    f"Mismatched brackets: '{opener}' at line {open_line} closed with '{char}' at line {line}"
+                )
+                stack.pop()
+            else:
+                stack.pop()
+        if char == '\n':
+            line += 1
+            col = 1
+        else:
+            col += 1
+    for opener, open_line, open_col in stack:
+        errors.append(f"Unclosed '{opener}' at line {open_line}, col {open_col}")
+    return errors
+
+
+def _reference_trailing_errors(content: str) -> list:
+    """The original per-line trailing '.' scan."""
+    errors = []
+    for i, line in enumerate(content.split('\n'), 1):
+        stripped_line = line.rstrip()
+        if not stripped_line:
+            continue
+        if re.search(r'(?<![0-9a-zA-Z_$\]\)])\.\s*$', stripped_line):
+            if not re.search(r'\.\.\.$', stripped_line):
+                errors.append(f"Suspicious trailing '.' at line {i}")
+    return errors
+
+
+class TestValidateSyntax:
+    """Tests for picking a syntax checker by file extension."""
+
+    @pytest.mark.parametrize("file_path", ["json", "config/json", "dir/py", "scripts/yaml", "Makefile"])
+    def test_extensionless_files_are_not_checked(self, file_path):
+        """A file name without an extension never matches a checker."""
+        assert _validate_syntax("not { valid", file_path) == []
+
+    @pytest.mark.parametrize("file_path", ["package.json", "src/.config/app.json"])
+    def test_json_extension_is_checked(self, file_path):
+        """Files ending in .json get the JSON checker."""
+        assert _validate_syntax("not { valid", file_path)
+
+    def test_dotted_directory_does_not_set_extension(self):
+        """Only the file name's extension counts, not a dot in a directory name."""
+        assert _validate_syntax("def (", "pkg.py/README") == []
+
+
+class TestStripStringsAndComments:
+    """Tests that the regex stripper matches the scanner it replaced."""
+
+    @pytest.mark.parametrize("content", [
+        # Template literals
+        "const s = `a ${b} (c`;\nf(s);",
+        "const s = `line one\n{ line two`;",
+        "const s = `escaped \\` still (inside`;",
+        "const s = `never closed (\n{",
+        # Regex literals (not special-cased by either implementation)
+        "const re = /[(]/g; f(re);",
+        "const re = /\\/\\*/; x();",
+        "const re = /\"/; g(\"(\");",
+        # Escaped quotes
+        "const s = \"say \\\"hi\\\" (\"; f(s);",
+        "const s = 'it\\'s (open'; g();",
+        "const s = 'ends with backslash \\\\'; h();",
+        "const s = \"trailing backslash \\",
+        "const s = \"escaped newline \\\n(\";",
+        # // inside strings
+        "const url = \"https://example.com/(\"; f(url);",
+        "const s = '// not a comment {'; g();",
+        "const s = `//${x}`; // real comment (",
+        # Unterminated comments and strings
+        "f(); /* never closed (",
+        "f(); /* never closed\n{ [",
+        "f(); /*",
+        "f(); /*/",
+        "/**/ f(/* a */);",
+        "const s = \"unterminated (\nf();",
+        "const s = 'unterminated",
+        # Comments
+        "a(); // trailing { comment\nb();",
+        "/* multi\n * line ( comment */ c();",
+        "<div>/* x */</div>",
+    ])
+    def test_matches_reference(self, content):
+        """Output is identical to the original scanner, character for character."""
+        assert _strip_strings_and_comments(content) == _reference_strip(content)
+
+    def test_preserves_line_structure(self):
+        """Blanked literals and comments keep their newlines and overall length."""
+        content = "a(`x\n(`);\n/* y\n{ */ b();"
+        stripped = _strip_strings_and_comments(content)
+        assert len(stripped) == len(content)
+        assert stripped.count("\n") == content.count("\n")
+
+
+_BRACKET_CASES = [
+    "",
+    "f(a[0], {b: [1, 2]});",
+    "function f() {\n  if (x) {\n    return [1, (2)];\n  }\n}\n",
+    # Unbalanced
+    "f(a;",
+    "f(a));",
+    "}\nconst x = 1;",
+    "function f() {\n  return [1, 2;\n",
+    "((((",
+    "]]\n))",
+    # Mismatched
+    "f(a];",
+    "const x = {a: [1, 2};\n",
+    "{ ( [ } ) ]",
+    # Nested
+    "a({b: [c(d[e({})])]})",
+    "a({b: [c(d[e({)])]})",
+    "{\n  [\n    (\n  ]\n}",
+    # Brackets only in strings and comments
+    "const s = \"(\"; // {\n/* [ */ f();",
+]
+
+
+class TestBracketBalance:
+    """Tests that the fast path and bracket walk report what the original check did."""
+
+    @pytest.mark.parametrize("content", _BRACKET_CASES)
+    def test_matches_reference(self, content):
+        """Errors, including line and column numbers, are unchanged."""
+        assert _check_bracket_balance(content, "a.js") == _reference_bracket_errors(content)
+
+    @pytest.mark.parametrize("content", _BRACKET_CASES)
+    def test_fast_path_agrees_with_walk(self, content):
+        """The bracket-only fast path passes exactly the inputs the full walk finds no errors in."""
+        stripped = _strip_strings_and_comments(content)
+        assert _brackets_balanced(stripped) == (not _reference_bracket_errors(content))
+
+
+class TestLineNumbers:
+    """Tests for bisect-based offset to line mapping."""
+
+    @pytest.mark.parametrize("text", ["", "one line", "a\nb\nc", "\n\n\nx\n", "ends with newline\n"])
+    def test_matches_newline_count(self, text):
+        """Every offset maps to the line counting newlines before it gives."""
+        positions = list(range(len(text) + 1))
+        assert _line_numbers(text, positions) == [text[:pos].count("\n") + 1 for pos in positions]
+
+    def test_no_positions(self):
+        """No lookups returns no line numbers."""
+        assert _line_numbers("a\nb", []) == []
+
+    @pytest.mark.parametrize("content", [
+        "return (\n  <div>\n    <span>x</span>.\n  </div>\n);",
+        "const a = <b/>,\nconst c = (\n  <div<\n);",
+        "<p>ok</p>\n<div class='x'<span>\n</p>;",
+    ])
+    def test_jsx_error_lines(self, content):
+        """JSX errors report the lines a per-match newline count gives."""
+        stripped = _reference_strip(content)
+        invalid = [
+            f"Invalid '{m.group(1)}' after JSX closing tag at line {stripped[:m.start()].count(chr(10)) + 1}"
+            for m in re.finditer(r'(?:<\/[a-zA-Z][a-zA-Z0-9]*\s*>|\/\s*>)\s*([.,])\s*(?=\)|;|\n|$)', stripped)
+        ]
+        broken = [
+            f"Malformed JSX tag '<{m.group(1)}' at line {stripped[:m.start()].count(chr(10)) + 1}"
+            for m in re.finditer(r'<([a-zA-Z][a-zA-Z0-9]*)[^>]*<(?![!/])', stripped)
+        ]
+        assert _check_jsx_syntax(content, "a.jsx") == invalid + broken
+        assert invalid + broken
+
+
+class TestTrailingSyntax:
+    """Tests that the multiline trailing '.' regex matches the per-line scan it replaced."""
+
+    @pytest.mark.parametrize("content", [
+        # Dot at end of file, with and without a final newline
+        "const a = b\n  .",
+        "const a = b\n  .\n",
+        "const a = b .   ",
+        ".",
+        # CRLF line endings
+        "const a = b\r\n  .\r\nf();\r\n",
+        "x = [1, 2]\r\ny = obj.\r\n",
+        "const a = b .\r",
+        # Trailing dot inside a comment or string (not stripped by either scan)
+        "f(); // see the docs .\ng();",
+        "/* ends the sentence .\n */",
+        "const s = \"ends with .\nmore\";",
+        "const s = `multi\nline .\n`;",
+        # Not suspicious
+        "const v = 1.\nconst w = x).\nconst y = a.b",
+        "f(...\n  args)",
+        "const r = [...\n  xs]",
+        "a..",
+        "a ..",
+        "a ....",
+        "",
+    ])
+    def test_matches_reference(self, content):
+        """Reported lines are identical to the per-line scan."""
+        assert _check_trailing_syntax(content, "a.js") == _reference_trailing_errors(content)
+
+    def test_reports_every_line(self):
+        """Each suspicious line is reported once, in order."""
+        content = "a = b\n  .\nc = d\r\n  .\r\ne()\n ."
+        assert _check_trailing_syntax(content, "a.js") == [
+            "Suspicious trailing '.' at line 2",
+            "Suspicious trailing '.' at line 4",
+            "Suspicious trailing '.' at line 6",
+        ]
+
+
+class TestPythonCheckPool:
+    """Tests for compiling Python files inline or in the process pool."""
+
+    _FILES = {
+        "ok.py": "x = 1\n",
+        "bad.py": "def f(:\n    pass\n",
+        "worse.py": "x = 1\nif True\n    y = 2\n",
+        "pkg/also_ok.py": "def g():\n    return [i for i in range(3)]\n",
+    }
+
+    @pytest.mark.asyncio
+    async def test_small_batches_stay_inline(self):
+        """Batches under the thresholds never start the pool."""
+        await check.close_python_check_pool()
+        await check._check_python_files(self._FILES)
+        assert check._python_pool is None
+
+    @pytest.mark.asyncio
+    async def test_pool_matches_inline(self, monkeypatch):
+        """Forcing the pool path reports the same errors as compiling inline, then shuts down."""
+        inline = await check._check_python_files(self._FILES)
+        monkeypatch.setattr(check, "_PYTHON_POOL_MIN_FILES", 1)
+        monkeypatch.setattr(check, "_PYTHON_POOL_MIN_BYTES", 0)
+        try:
+            pooled = await check._check_python_files(self._FILES)
+            assert check._python_pool is not None
+        finally:
+            await check.close_python_check_pool()
+
+        assert pooled == inline
+        assert inline["bad.py"] and inline["worse.py"]
+        assert inline["ok.py"] == [] and inline["pkg/also_ok.py"] == []
+        assert check._python_pool is None
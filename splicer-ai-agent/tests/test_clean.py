@@ -0,0 +1,75 @@
+"""Tests for the clean node's .splicer/ deletion."""
+
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+
+from agent.nodes import clean
+
+_CONFIG = {"configurable": {"github_token": "token"}}
+_FILES = [".splicer/a.tsx", ".splicer/b.ts"]
+
+
+class FakeTool:
+    """MCP tool stand-in that records its calls."""
+
+    def __init__(self, name, calls):
+        self.name = name
+        self.calls = calls
+
+    async def ainvoke(self, arguments):
+        self.calls.append((self.name, arguments.get("path")))
+        if self.name == "get_file_contents":
+            listing = [{"type": "file", "path": path} for path in _FILES]
+            return [{"type": "text", "text": json.dumps(listing)}]
+        return None
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Replace the MCP tools with fakes; yields the recorded tool calls."""
+    recorded = []
+
+    @asynccontextmanager
+    async def fake_github_tools(config, fresh=False):
+        yield [FakeTool("get_file_contents", recorded), FakeTool("delete_file", recorded)]
+
+    monkeypatch.setattr(clean, "github_tools", fake_github_tools)
+    yield recorded
+
+
+def _fake_graphql(commit_succeeds, mutations):
+    async def fake_github_graphql(token, query, variables):
+        if query.startswith("query"):
+            return {"repository": {"ref": {"target": {"oid": "head"}}}}
+        mutations.append(variables["input"])
+        return {"createCommitOnBranch": {"commit": {"oid": "new"}}} if commit_succeeds else {}
+    return fake_github_graphql
+
+
+class TestCleanUp:
+    """Tests for deleting .splicer/ in one commit, or file by file as a fallback."""
+
+    @pytest.mark.asyncio
+    async def test_deletes_all_files_in_one_commit(self, calls, monkeypatch):
+        """Every file goes in a single createCommitOnBranch; delete_file is never called."""
+        mutations = []
+        monkeypatch.setattr(clean, "github_graphql", _fake_graphql(True, mutations))
+
+        await clean.clean_up({"target_repo": "owner/repo", "branch": "splice"}, _CONFIG)
+
+        assert len(mutations) == 1
+        assert mutations[0]["fileChanges"] == {"deletions": [{"path": path} for path in _FILES]}
+        assert mutations[0]["expectedHeadOid"] == "head"
+        assert mutations[0]["branch"] == {"repositoryNameWithOwner": "owner/repo", "branchName": "splice"}
+        assert [name for name, _ in calls] == ["get_file_contents"]
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_sequential_deletes(self, calls, monkeypatch):
+        """If the single commit fails, each file is deleted in listing order."""
+        monkeypatch.setattr(clean, "github_graphql", _fake_graphql(False, []))
+
+        await clean.clean_up({"target_repo": "owner/repo", "branch": "splice"}, _CONFIG)
+
+        assert calls[1:] == [("delete_file", path) for path in _FILES]
@@ -0,0 +1,179 @@
+"""Tests for the pooled GitHub MCP sessions."""
+
+import asyncio
+
+import anyio
+import pytest
+
+import components.github_mcp as github_mcp
+
+
+class FakeSession:
+    """Stand-in for an MCP ClientSession whose streams can be closed."""
+
+    def __init__(self):
+        self.streams_closed = False
+        self.closed_by_owner = False
+
+    async def call_tool(self, name, arguments):
+        if self.streams_closed:
+            raise anyio.ClosedResourceError()
+        return name
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    """Replace the session owner with a fake; yields the sessions it opened."""
+    sessions = []
+
+    async def fake_own_session(token, ready, closing):
+        session = FakeSession()
+        sessions.append(session)
+        # Yield to the loop so concurrent borrowers arrive while the open is in flight
+        await asyncio.sleep(0.01)
+        tracked = github_mcp._TrackedSession(session)
+        ready.set_result(([tracked], tracked))
+        await closing.wait()
+        session.closed_by_owner = True
+
+    monkeypatch.setattr(github_mcp, "_own_session", fake_own_session)
+    monkeypatch.setattr(github_mcp, "_idle_sessions", {})
+    monkeypatch.setattr(github_mcp, "_active_sessions", {})
+    monkeypatch.setattr(github_mcp, "_opening_sessions", {})
+    monkeypatch.setattr(github_mcp, "_sessions_by_tools", {})
+    yield sessions
+
+
+class TestBorrowSession:
+    """Tests for sharing and reusing pooled sessions."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_borrows_open_one_session(self, opened):
+        """Callers arriving together share a single open."""
+        async def borrow():
+            async with github_mcp.github_session("token") as tools:
+                await asyncio.sleep(0.01)
+                return tools[0]
+
+        tracked = await asyncio.gather(*(borrow() for _ in range(5)))
+
+        assert len(opened) == 1
+        assert all(t is tracked[0] for t in tracked)
+        await github_mcp.close_idle_sessions()
+
+    @pytest.mark.asyncio
+    async def test_idle_session_is_reused(self, opened):
+        """A session released cleanly is handed to the next borrower."""
+        async with github_mcp.github_session("token"):
+            pass
+        async with github_mcp.github_session("token"):
+            pass
+
+        assert len(opened) == 1
+        await github_mcp.close_idle_sessions()
+
+    @pytest.mark.asyncio
+    async def test_release_after_failure_is_not_reused(self, opened):
+        """A session whose borrower raised is closed, and the next borrow opens anew."""
+        with pytest.raises(RuntimeError):
+            async with github_mcp.github_session("token"):
+                raise RuntimeError("tool failed")
+        async with github_mcp.github_session("token"):
+            pass
+
+        assert len(opened) == 2
+        await asyncio.sleep(0)
+        assert opened[0].closed_by_owner
+        await github_mcp.close_idle_sessions()
+
+    @pytest.mark.asyncio
+    async def test_closed_streams_are_not_reused(self, opened):
+        """A session that hit ClosedResourceError is retired even if the caller swallowed it."""
+        async with github_mcp.github_session("token") as tools:
+            opened[0].streams_closed = True
+            with pytest.raises(anyio.ClosedResourceError):
+                await tools[0].call_tool("get_file_contents", {})
+        async with github_mcp.github_session("token"):
+            pass
+
+        assert len(opened) == 2
+        await github_mcp.close_idle_sessions()
+
+    @pytest.mark.asyncio
+    async def test_expired_session_is_replaced(self, opened, monkeypatch):
+        """An idle session older than the max age is closed instead of reused."""
+        async with github_mcp.github_session("token"):
+            pass
+        monkeypatch.setattr(github_mcp, "_SESSION_MAX_AGE", 0.0)
+        async with github_mcp.github_session("token"):
+            pass
+
+        assert len(opened) == 2
+        await asyncio.sleep(0)
+        assert opened[0].closed_by_owner
+        await github_mcp.close_idle_sessions()
+
+    @pytest.mark.asyncio
+    async def test_fresh_session_is_not_shared(self, opened):
+        """fresh=True opens a new session even while one is lent out."""
+        async with github_mcp.github_session("token") as shared:
+            async with github_mcp.github_session("token", fresh=True) as fresh:
+                assert fresh[0] is not shared[0]
+
+        assert len(opened) == 2
+        await github_mcp.close_idle_sessions()
+
+
+class TestCloseIdleSessions:
+    """Tests for shutting down the pool."""
+
+    @pytest.mark.asyncio
+    async def test_closes_idle_sessions(self, opened):
+        """Every idle session is closed and its owner task finishes."""
+        async with github_mcp.github_session("token-a"):
+            pass
+        async with github_mcp.github_session("token-b"):
+            pass
+        tasks = [pooled.task for idle in github_mcp._idle_sessions.values() for pooled in idle]
+
+        await github_mcp.close_idle_sessions()
+
+        assert github_mcp._idle_sessions == {}
+        assert all(task.done() for task in tasks)
+        assert all(session.closed_by_owner for session in opened)
+
+
+class TestRunWideTools:
+    """Tests for github_tools with the run's shared session in config."""
+
+    @pytest.mark.asyncio
+    async def test_reuses_live_shared_session(self, opened):
+        """Nodes get the run-wide tools while their session is up."""
+        async with github_mcp.github_session("token") as mcp_tools:
+            config = {"configurable": {"github_token": "token", github_mcp.MCP_TOOLS_CONFIG_KEY: mcp_tools}}
+            async with github_mcp.github_tools(config) as node_tools:
+                assert node_tools is mcp_tools
+
+        assert len(opened) == 1
+        await github_mcp.close_idle_sessions()
+
+    @pytest.mark.asyncio
+    async def test_shared_session_dies_mid_run(self, opened):
+        """Once the run-wide session closes, later nodes work on a fresh session."""
+        async with github_mcp.github_session("token") as mcp_tools:
+            config = {"configurable": {"github_token": "token", github_mcp.MCP_TOOLS_CONFIG_KEY: mcp_tools}}
+
+            # A node whose tool call finds the streams closed fails
+            opened[0].streams_closed = True
+            with pytest.raises(anyio.ClosedResourceError):
+                async with github_mcp.github_tools(config) as node_tools:
+                    await node_tools[0].call_tool("create_branch", {})
+
+            # The next node gets working tools instead of the dead ones
+            async with github_mcp.github_tools(config) as node_tools:
+                assert node_tools is not mcp_tools
+                assert await node_tools[0].call_tool("get_file_contents", {}) == "get_file_contents"
+
+        assert len(opened) == 2
+        await github_mcp.close_idle_sessions()
+        assert all(session.closed_by_owner for session in opened)
@@ -0,0 +1,96 @@
+"""Tests for the dependency tool's package.json handling."""
+
+import json
+
+import pytest
+
+import components.tools as tools
+from components.tools import _add_dependencies, _existing_dependency_version
+
+
+def _package_json(**fields) -> str:
+    return json.dumps({"name": "app", "version": "1.0.0", **fields}, indent=2)
+
+
+class TestExistingDependencyVersion:
+    """Tests for the no-parse lookup in the top-level dependencies object."""
+
+    def test_finds_top_level_dependency(self):
+        """A package in dependencies returns its version."""
+        content = _package_json(dependencies={"react": "^18.2.0", "framer-motion": "^11.0.0"})
+        assert _existing_dependency_version(content, "framer-motion") == "^11.0.0"
+
+    def test_ignores_dev_dependencies(self):
+        """A package only in devDependencies is not reported as present."""
+        content = _package_json(
+            dependencies={"react": "^18.2.0"},
+            devDependencies={"typescript": "^5.0.0"},
+        )
+        assert _existing_dependency_version(content, "typescript") is None
+
+    def test_dev_dependencies_before_dependencies(self):
+        """devDependencies listed first do not hide the dependencies entry."""
+        content = _package_json(
+            devDependencies={"react": "^17.0.0"},
+            dependencies={"react": "^18.2.0"},
+        )
+        assert _existing_dependency_version(content, "react") == "^18.2.0"
+
+    def test_nested_dependencies_are_not_top_level(self):
+        """A "dependencies" object nested before the real one never produces a hit."""
+        content = _package_json(
+            overrides={"some-lib": {"dependencies": {"lodash": "^4.17.21"}}},
+            dependencies={"react": "^18.2.0"},
+        )
+        assert _existing_dependency_version(content, "lodash") is None
+
+    def test_braces_inside_strings_do_not_affect_depth(self):
+        """Braces in string values before the key are ignored."""
+        content = _package_json(
+            description="uses {curly} braces and \"quotes\"",
+            dependencies={"react": "^18.2.0"},
+        )
+        assert _existing_dependency_version(content, "react") == "^18.2.0"
+
+    def test_missing_package(self):
+        """A package not in dependencies returns None."""
+        content = _package_json(dependencies={"react": "^18.2.0"})
+        assert _existing_dependency_version(content, "vue") is None
+
+    def test_missing_dependencies_object(self):
+        """A package.json without dependencies returns None."""
+        assert _existing_dependency_version(_package_json(), "react") is None
+
+
+class TestAddDependencies:
+    """Tests for adding packages to package.json content."""
+
+    @pytest.fixture(autouse=True)
+    def _no_stream_writer(self, monkeypatch):
+        monkeypatch.setattr(tools, "get_stream_writer", lambda: lambda *_: None)
+
+    def test_skips_existing_dependency(self):
+        """Existing packages are skipped and the content is returned unchanged."""
+        content = _package_json(dependencies={"react": "^18.2.0"})
+        updated, results = _add_dependencies(content, [("react", "^18.3.0")])
+
+        assert updated == content
+        assert results == [{"name": "react", "version": "^18.2.0", "status": "skipped"}]
+
+    def test_adds_package_only_in_nested_dependencies(self):
+        """A package that appears only in a nested dependencies object is still added."""
+        content = _package_json(
+            overrides={"some-lib": {"dependencies": {"lodash": "^4.17.21"}}},
+            dependencies={"react": "^18.2.0"},
+        )
+        updated, results = _add_dependencies(content, [("lodash", "^4.17.21")])
+
+        assert results == [{"name": "lodash", "version": "^4.17.21", "status": "added"}]
+        assert json.loads(updated)["dependencies"] == {"react": "^18.2.0", "lodash": "^4.17.21"}
+
+    def test_adds_missing_dependencies_object(self):
+        """Packages are added under a new dependencies object when there is none."""
+        updated, results = _add_dependencies(_package_json(), [("react", "^18.2.0"), ("vue", "^3.4.0")])
+
+        assert [r["status"] for r in results] == ["added", "added"]
+        assert json.loads(updated)["dependencies"] == {"react": "^18.2.0", "vue": "^3.4.0"}
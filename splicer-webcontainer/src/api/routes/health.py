@@ -5,11 +5,14 @@ Cloud Run uses these endpoints to determine:
 - Readiness: Is the container ready to serve traffic?
 """
 
+import time
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Response
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
+from src import __version__
 from src.config import get_settings
 
 router = APIRouter(tags=["health"])
@@ -21,7 +24,7 @@ class HealthResponse(BaseModel):
     status: str
     timestamp: str
     instance_id: str
-    version: str = "0.1.0"
+    version: str = __version__
 
 
 class ReadinessResponse(BaseModel):
@@ -35,6 +38,35 @@ class ReadinessResponse(BaseModel):
 # Track readiness state
 _ready = False
 
+# Probe timestamp, reformatted at most once per second (probes only need
+# second resolution, and Cloud Run hits these endpoints continuously)
+_timestamp_at = 0.0
+_timestamp = ""
+
+
+def _iso_now() -> str:
+    """Return the current UTC time as an ISO string, cached for one second."""
+    global _timestamp_at, _timestamp
+    now = time.time()
+    if now - _timestamp_at >= 1.0:
+        _timestamp_at = now
+        _timestamp = datetime.fromtimestamp(now, timezone.utc).isoformat()
+    return _timestamp
+
+
+# Instance identity is fixed for the container's lifetime. Resolved on first
+# request rather than at import, so importing the router never requires the
+# full settings environment.
+_instance_id: str | None = None
+
+
+def _get_instance_id() -> str:
+    """Return the full instance ID, reading settings once."""
+    global _instance_id
+    if _instance_id is None:
+        _instance_id = get_settings().full_instance_id
+    return _instance_id
+
 
 def set_ready(ready: bool) -> None:
     """Set the readiness state.
@@ -63,18 +95,20 @@ def is_ready() -> bool:
     summary="Liveness check",
     description="Returns 200 if the service is alive. Used by Cloud Run for liveness probes.",
 )
-async def health_check() -> HealthResponse:
+async def health_check() -> JSONResponse:
     """Liveness check endpoint.
     
     Always returns 200 if the server is running.
+    
+    Returns the HealthResponse fields as a plain JSONResponse, so probes skip
+    model construction and FastAPI's response validation/encoding pass.
     """
-    settings = get_settings()
-
-    return HealthResponse(
-        status="healthy",
-        timestamp=datetime.now(timezone.utc).isoformat(),
-        instance_id=settings.full_instance_id,
-    )
+    return JSONResponse({
+        "status": "healthy",
+        "timestamp": _iso_now(),
+        "instance_id": _get_instance_id(),
+        "version": __version__,
+    })
 
 
 @router.get(
@@ -83,11 +117,12 @@ async def health_check() -> HealthResponse:
     summary="Readiness check",
     description="Returns 200 if the service is ready to serve traffic. Used by Cloud Run for readiness probes.",
 )
-async def readiness_check(response: Response) -> ReadinessResponse:
+async def readiness_check() -> JSONResponse:
     """Readiness check endpoint.
     
     Returns 200 if all dependencies are connected and the service is ready.
-    Returns 503 if not ready.
+    Returns 503 if not ready. Like /health, the ReadinessResponse fields are
+    returned as a plain JSONResponse.
     """
     checks = {
         "initialized": _ready,
@@ -95,13 +130,13 @@ async def readiness_check(response: Response) -> ReadinessResponse:
 
     all_ready = all(checks.values())
 
-    if not all_ready:
-        response.status_code = 503
-
-    return ReadinessResponse(
-        status="ready" if all_ready else "not_ready",
-        timestamp=datetime.now(timezone.utc).isoformat(),
-        checks=checks,
+    return JSONResponse(
+        {
+            "status": "ready" if all_ready else "not_ready",
+            "timestamp": _iso_now(),
+            "checks": checks,
+        },
+        status_code=200 if all_ready else 503,
     )
 
 
@@ -114,10 +149,8 @@ async def root() -> dict:
     
     Useful for verifying the service is deployed.
     """
-    settings = get_settings()
-
     return {
         "service": "splicer-webcontainer",
-        "version": "0.1.0",
-        "instance": settings.full_instance_id,
+        "version": __version__,
+        "instance": _get_instance_id(),
     }